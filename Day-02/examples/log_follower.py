@@ -0,0 +1,297 @@
+"""Follow a growing log and keep live per-minute counts per level and pattern.
+
+`logscan.py` scans a whole file once. This tool follows one file, the way
+`tail -f` does (for example `LOG_FILE` from Day 6's `server.conf`):
+
+- it only reads the bytes added since the last poll, and only whole lines.
+  A half-written last line is read again on the next poll.
+- it saves its byte offset and the file's inode to a small state file after
+  each poll. A restart resumes where it stopped. A rotated file (new inode)
+  is finished first and then the new file is read from the start. A
+  truncated file is read again from the start.
+- it counts log levels (ERROR, WARNING, ...) and the `logscan` patterns, at
+  most once per line, finding candidate lines with the same combined regex
+  and then trying every pattern on them, so overlapping patterns all count.
+- it keeps counts in one bucket per minute, for the last `--window` minutes
+  only, so memory stays fixed however long it runs. Lines are bucketed by
+  the time they were read, not by the timestamp inside the line.
+
+Counts can be read as JSON from a local HTTP endpoint (`--port`), written to a
+file after every poll (`--snapshot-file`), or both.
+
+Usage example:
+    python3 log_follower.py /var/log/server.log --port 9100
+    curl -s localhost:9100/metrics
+    python3 log_follower.py --config ../../Day-06/examples/file-automation/server.conf --snapshot-file metrics.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from logscan import compile_each, compile_patterns, load_patterns, matching_lines
+
+LEVEL_PATTERN = re.compile(rb"\b(DEBUG|INFO|WARN(?:ING)?|ERROR|CRITICAL|FATAL)\b")
+LEVEL_NAMES = {b"WARN": "WARNING"}
+READ_SIZE = 4 * 1024 * 1024
+DEFAULT_STATE = ".log_follower_state.json"
+
+
+def count_lines(data: bytes, regex: re.Pattern, names: Optional[Dict[bytes, str]] = None) -> Counter:
+    """Count lines in `data` per level name; a level that appears twice on one line counts once."""
+    counts: Counter = Counter()
+    current_line = -1
+    seen_on_line: Set[str] = set()
+    for found in regex.finditer(data):
+        name = (names or {}).get(found.group(1)) or found.group(1).decode("ascii")
+        line_start = data.rfind(b"\n", 0, found.start()) + 1
+        if line_start != current_line:
+            current_line = line_start
+            seen_on_line.clear()
+        if name in seen_on_line:
+            continue
+        seen_on_line.add(name)
+        counts[name] += 1
+    return counts
+
+
+class RollingCounts:
+    """Per-minute counters for the last `window` minutes; older buckets fall off the deque."""
+
+    def __init__(self, window: int = 60) -> None:
+        self.window = window
+        self.buckets: Deque[Tuple[int, Counter]] = deque(maxlen=window)
+        self.totals: Counter = Counter()
+
+    def add(self, counts: Counter, now: Optional[float] = None) -> None:
+        minute = int((time.time() if now is None else now) // 60)
+        if not self.buckets or self.buckets[-1][0] != minute:
+            self.buckets.append((minute, Counter()))
+        self.buckets[-1][1].update(counts)
+        self.totals.update(counts)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, object]:
+        current = int((time.time() if now is None else now) // 60)
+        recent = [(minute, counts) for minute, counts in self.buckets if minute > current - self.window]
+        last_minute = next((counts for minute, counts in recent if minute == current), Counter())
+        in_window: Counter = Counter()
+        for _, counts in recent:
+            in_window.update(counts)
+        return {
+            "last_minute": dict(last_minute),
+            f"last_{self.window}_minutes": dict(in_window),
+            "since_start": dict(self.totals),
+            "per_minute": [
+                {"minute": time.strftime("%Y-%m-%dT%H:%M", time.localtime(minute * 60)), "counts": dict(counts)}
+                for minute, counts in recent
+            ],
+        }
+
+
+class LogFollower:
+    def __init__(self, path: str, state_path: str, patterns: Dict[str, str], window: int = 60, from_start: bool = False) -> None:
+        self.path = path
+        self.state_path = state_path
+        self.regex = compile_patterns(patterns)
+        self.each = compile_each(patterns)
+        self.levels = RollingCounts(window)
+        self.patterns = RollingCounts(window)
+        self.lock = threading.Lock()
+        self.handle = None
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.rotations = 0
+        self.from_start = from_start
+        self.load_state()
+
+    def load_state(self) -> None:
+        try:
+            with open(self.state_path, encoding="utf-8") as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            print(f"Ignoring unreadable state file {self.state_path}: {exc}", file=sys.stderr)
+            return
+        if state.get("path") == os.path.abspath(self.path):
+            self.inode, self.offset = state.get("inode"), state.get("offset", 0)
+
+    def save_state(self) -> None:
+        # Write to a temp file and rename, so a crash never leaves half a state file.
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"path": os.path.abspath(self.path), "inode": self.inode, "offset": self.offset}, handle)
+        os.replace(temp_path, self.state_path)
+
+    def open_file(self, resume: bool) -> bool:
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return False  # between rotation steps; try again on the next poll
+        stat = os.fstat(handle.fileno())
+        if resume and stat.st_ino == self.inode and stat.st_size >= self.offset:
+            pass  # same file as last time: carry on from the saved offset
+        elif resume and self.inode is None and not self.from_start:
+            self.offset = stat.st_size  # first run: like `tail -f`, only new lines
+        else:
+            self.offset = 0  # rotated while we were not looking, or --from-start
+        self.handle, self.inode = handle, stat.st_ino
+        return True
+
+    def read_complete_lines(self) -> int:
+        """Count every whole line after `offset` in the open file; returns the bytes consumed."""
+        consumed = 0
+        if os.fstat(self.handle.fileno()).st_size < self.offset:
+            self.offset = 0  # truncated in place (copytruncate)
+        while True:
+            self.handle.seek(self.offset)
+            data = self.handle.read(READ_SIZE)
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                if len(data) < READ_SIZE:
+                    return consumed  # nothing new, or an unfinished last line
+                end = len(data)  # one huge line: count it in pieces rather than buffer it forever
+            block = data[:end]
+            levels = count_lines(block, LEVEL_PATTERN, LEVEL_NAMES)
+            patterns = Counter(name for _, _, names in matching_lines(block, self.regex, self.each, 0, len(block)) for name in names)
+            with self.lock:
+                self.levels.add(levels)
+                self.patterns.add(patterns)
+                self.offset += end
+            consumed += end
+
+    def poll(self) -> int:
+        """Read what was appended since the last poll; returns the bytes consumed."""
+        if self.handle is None and not self.open_file(resume=True):
+            return 0
+        consumed = self.read_complete_lines()
+        try:
+            rotated = os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            rotated = False  # renamed away, new file not created yet
+        if rotated:
+            # The old file is fully read now; switch to the new one from its first byte.
+            self.handle.close()
+            self.handle = None
+            if self.open_file(resume=False):
+                self.rotations += 1
+                consumed += self.read_complete_lines()
+        if consumed or rotated:
+            self.save_state()
+        return consumed
+
+    def snapshot(self) -> Dict[str, object]:
+        with self.lock:
+            return {
+                "path": self.path,
+                "inode": self.inode,
+                "offset": self.offset,
+                "rotations": self.rotations,
+                "updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "levels": self.levels.snapshot(),
+                "patterns": self.patterns.snapshot(),
+            }
+
+    def close(self) -> None:
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+
+def write_snapshot(path: str, snapshot: Dict[str, object]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(snapshot, handle, indent=2)
+    os.replace(temp_path, path)
+
+
+def serve_metrics(follower: LogFollower, port: int) -> ThreadingHTTPServer:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = json.dumps(follower.snapshot(), indent=2).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass  # keep the terminal for our own output
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def log_file_from_config(config_path: str) -> str:
+    """Read `LOG_FILE = ...` from a Day 6 style `server.conf`."""
+    with open(config_path, encoding="utf-8") as handle:
+        for line in handle:
+            match = re.match(r"\s*LOG_FILE\s*=\s*(.+?)\s*$", line)
+            if match:
+                return match.group(1)
+    raise SystemExit(f"No LOG_FILE in {config_path}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Follow a log file and keep rolling per-minute counts")
+    parser.add_argument("path", nargs="?", help="Log file to follow (or use --config)")
+    parser.add_argument("--config", help="Take the path from LOG_FILE in this config file")
+    parser.add_argument("--state", default=DEFAULT_STATE, help=f"Where to keep the offset and inode (default: {DEFAULT_STATE})")
+    parser.add_argument("--from-start", action="store_true", help="Without saved state, read the existing file too instead of only new lines")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls (default: 1)")
+    parser.add_argument("--window", type=int, default=60, help="Minutes of per-minute buckets to keep (default: 60)")
+    parser.add_argument("--port", type=int, help="Serve the counts as JSON on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--snapshot-file", help="Write the counts as JSON to this file after every poll")
+    parser.add_argument("--pattern", action="append", default=[], metavar="NAME=REGEX", help="Extra pattern (repeatable)")
+    parser.add_argument("--patterns-file", help="File with one NAME=REGEX per line")
+    parser.add_argument("--only", help="Comma-separated pattern names to use")
+    parser.add_argument("--no-defaults", action="store_true", help="Do not include the built-in patterns")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    path = args.path or (log_file_from_config(args.config) if args.config else None)
+    if not path:
+        raise SystemExit("Give a log file or --config server.conf")
+    patterns = load_patterns(args)
+    try:
+        follower = LogFollower(path, args.state, patterns, args.window, args.from_start)
+    except (ValueError, re.error) as exc:
+        raise SystemExit(f"Bad pattern: {exc}")
+
+    server = serve_metrics(follower, args.port) if args.port else None
+    where = f" on http://127.0.0.1:{args.port}/metrics" if server else ""
+    print(f"Following {path}{where}; press Ctrl+C to stop", file=sys.stderr)
+    try:
+        while True:
+            follower.poll()
+            if args.snapshot_file:
+                write_snapshot(args.snapshot_file, follower.snapshot())
+            if not server and not args.snapshot_file:
+                last_minute = follower.snapshot()["levels"]["last_minute"]
+                print(f"{time.strftime('%H:%M:%S')} offset={follower.offset} this minute: {last_minute}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server:
+            server.shutdown()
+        follower.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Search big log files for many patterns at once.
+
+The `03-regex-*.py` examples run one pattern over one short string. Real logs
+(like `LOG_FILE = /var/log/server.log` in Day 6's `server.conf`) are often
+several GB and need many patterns. This tool:
+
+1. joins all patterns into ONE regex, `(?P<error>...)|(?P<timeout>...)|...`,
+   so each byte of the log is scanned once instead of once per pattern. It
+   only finds the lines worth looking at: on each such line the other
+   patterns are tried too, so patterns that overlap (`ERROR db` and
+   `db failed` on "ERROR db failed") are all counted, exactly like the naive
+   loop in `--benchmark`.
+2. memory-maps the file, so the OS pages it in and we never copy it all.
+3. cuts the file into chunks that end on a newline (about size / workers,
+   between 1 and 16 MB) and scans them on a pool of processes, printing
+   matches (with byte offsets) as chunks finish.
+
+Each pattern counts at most once per line. A pattern starting with global
+flags such as `(?i)` is turned into a scoped `(?i:...)` group so it can be
+combined with the others.
+
+Usage example:
+    python3 logscan.py /var/log/server.log
+    python3 logscan.py app.log --pattern 'slow=took \\d{4,} ms' --count
+    python3 logscan.py app.log --benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+DEFAULT_PATTERNS: Dict[str, str] = {
+    "error": r"\bERROR\b",
+    "warning": r"\bWARN(?:ING)?\b",
+    "exception": r"Traceback \(most recent call last\)|(?:Exception|Error): ",
+    "timeout": r"[Tt]imed? ?[Oo]ut",
+    "http_5xx": r"\" 5\d\d ",
+    "oom": r"Out of memory|OOMKilled",
+}
+CHUNK_SIZE = 16 * 1024 * 1024  # largest chunk per task, so results keep streaming on huge files
+MIN_CHUNK_SIZE = 1024 * 1024
+GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+MAX_LINE_CHARS = 500
+
+Match = Tuple[int, str, str]  # (byte offset of the line, pattern name, line)
+Buffer = Union[bytes, mmap.mmap]
+
+
+def scope_inline_flags(name: str, pattern: str) -> str:
+    """Turn a leading `(?i)` into `(?i:...)`: global flags are not allowed once the pattern is wrapped in a group."""
+    match = GLOBAL_FLAGS.match(pattern)
+    if match:
+        pattern = f"(?{match.group(1)}:{pattern[match.end():]})"
+    if re.search(r"\(\?[aiLmsux]+\)", pattern):
+        raise ValueError(f"Pattern {name!r} sets inline flags after the start; use a scoped group like (?i:...) instead")
+    return pattern
+
+
+def compile_patterns(patterns: Dict[str, str]) -> Pattern[bytes]:
+    """Combine named patterns into one bytes regex with a named group per pattern.
+
+    Used only to find candidate lines: once one pattern matches, the others are
+    tried on that line by matching_lines(), so overlapping matches are not lost.
+    """
+    parts = []
+    for name, pattern in patterns.items():
+        if not name.isidentifier():
+            raise ValueError(f"Pattern name {name!r} must be a valid identifier (letters, digits, _)")
+        pattern = scope_inline_flags(name, pattern)
+        compiled = re.compile(pattern.encode("utf-8"))
+        if compiled.groupindex:
+            raise ValueError(f"Pattern {name!r} has its own named groups; use (?:...) instead")
+        parts.append(f"(?P<{name}>{pattern})")
+    return re.compile("|".join(parts).encode("utf-8"), re.MULTILINE)
+
+
+def compile_each(patterns: Dict[str, str]) -> Dict[str, Pattern[bytes]]:
+    """Compile every pattern on its own, for checking a candidate line."""
+    return {name: re.compile(scope_inline_flags(name, pattern).encode("utf-8"), re.MULTILINE) for name, pattern in patterns.items()}
+
+
+def chunk_bounds(path: str, chunk_size: int = CHUNK_SIZE, workers: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split the file into (start, end) ranges that each end right after a newline.
+
+    Chunks are about size / workers so every worker gets a share even of a
+    small file, but never smaller than MIN_CHUNK_SIZE or larger than `chunk_size`.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    per_worker = -(-size // (workers or os.cpu_count() or 1))
+    chunk_size = max(MIN_CHUNK_SIZE, min(chunk_size, per_worker))
+    bounds = []
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            end = mapped.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def line_around(data: Buffer, position: int, start: int, end: int) -> Tuple[int, int]:
+    line_start = data.rfind(b"\n", start, position) + 1 or start
+    line_end = data.find(b"\n", position, end)
+    return line_start, end if line_end == -1 else line_end
+
+
+def matching_lines(
+    data: Buffer, regex: Pattern[bytes], each: Dict[str, Pattern[bytes]], start: int, end: int
+) -> Iterator[Tuple[int, int, List[str]]]:
+    """Yield (line start, line end, names of the patterns that match) for every line in [start, end) with a match.
+
+    The combined regex jumps to the next line where any pattern matches; the
+    patterns it did not report are then tried on that line alone. A name is
+    listed once per line, however often it matches there.
+    """
+    position = start
+    while position <= end:
+        found = regex.search(data, position, end)
+        if found is None:
+            return
+        line_start, line_end = line_around(data, found.start(), start, end)
+        names = [name for name, pattern in each.items() if name == found.lastgroup or pattern.search(data, line_start, line_end)]
+        yield line_start, line_end, names
+        position = line_end + 1
+
+
+def scan_chunk(path: str, start: int, end: int, patterns: Dict[str, str], count_only: bool) -> Tuple[Counter, List[Match]]:
+    """Runs in a worker process: scan bytes [start, end) of `path`."""
+    regex = compile_patterns(patterns)  # cached by `re`, so this is cheap after the first chunk
+    each = compile_each(patterns)
+    counts: Counter = Counter()
+    matches: List[Match] = []
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for line_start, line_end, names in matching_lines(mapped, regex, each, start, end):
+            counts.update(names)
+            if not count_only:
+                line = mapped[line_start:line_end].decode("utf-8", "replace")[:MAX_LINE_CHARS]
+                matches.extend((line_start, name, line) for name in names)
+    return counts, matches
+
+
+def scan_file(
+    path: str, patterns: Dict[str, str], workers: Optional[int] = None, count_only: bool = False, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[Counter, List[Match]]]:
+    """Yield (counts, matches) per chunk, in file order, as soon as each chunk is done."""
+    bounds = chunk_bounds(path, chunk_size, workers)
+    if not bounds:
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scan_chunk, path, start, end, patterns, count_only) for start, end in bounds]
+        for future in futures:
+            yield future.result()
+
+
+def naive_scan(path: str, patterns: Dict[str, str]) -> Counter:
+    """The straightforward way: every line, every pattern, one re.search each."""
+    compiled = {name: re.compile(pattern) for name, pattern in patterns.items()}
+    counts: Counter = Counter()
+    with open(path, "r", encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            for name, pattern in compiled.items():
+                if re.search(pattern, line):
+                    counts[name] += 1
+    return counts
+
+
+def run_benchmark(path: str, patterns: Dict[str, str], workers: Optional[int]) -> None:
+    size_mb = os.path.getsize(path) / 1_000_000
+
+    def timed(label: str, run) -> None:
+        started = time.perf_counter()
+        counts = run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:<34} {elapsed:>7.2f}s {size_mb / max(elapsed, 1e-9):>9.1f} MB/s  {sum(counts.values())} matching line(s)")
+
+    print(f"{path}: {size_mb:.1f} MB, {len(patterns)} pattern(s)")
+    timed("naive re.search per line/pattern", lambda: naive_scan(path, patterns))
+    timed("combined regex, 1 process", lambda: sum((c for c, _ in scan_file(path, patterns, 1, True)), Counter()))
+    timed(f"combined regex, {workers or os.cpu_count()} processes", lambda: sum((c for c, _ in scan_file(path, patterns, workers, True)), Counter()))
+
+
+def load_patterns(args: argparse.Namespace) -> Dict[str, str]:
+    patterns: Dict[str, str] = {} if args.no_defaults else dict(DEFAULT_PATTERNS)
+    lines: List[str] = list(args.pattern)
+    if args.patterns_file:
+        with open(args.patterns_file, encoding="utf-8") as handle:
+            lines += [line.rstrip("\n") for line in handle if line.strip() and not line.startswith("#")]
+    for entry in lines:
+        name, sep, pattern = entry.partition("=")
+        if not sep:
+            raise SystemExit(f"Patterns look like name=regex, got {entry!r}")
+        patterns[name.strip()] = pattern
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        patterns = {name: pattern for name, pattern in patterns.items() if name in wanted}
+    if not patterns:
+        raise SystemExit("No patterns to search for.")
+    return patterns
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scan large log files for many regex patterns in parallel")
+    parser.add_argument("paths", nargs="+", help="Log files to scan")
+    parser.add_argument("--pattern", action="append", default=[], metavar="NAME=REGEX", help="Extra pattern (repeatable)")
+    parser.add_argument("--patterns-file", help="File with one NAME=REGEX per line")
+    parser.add_argument("--only", help="Comma-separated pattern names to use")
+    parser.add_argument("--no-defaults", action="store_true", help="Do not include the built-in patterns")
+    parser.add_argument("--count", action="store_true", help="Only print how many times each pattern matched")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // (1024 * 1024), help="Largest chunk per task in MB (default: 16)")
+    parser.add_argument("--benchmark", action="store_true", help="Compare against a naive per-pattern re.search loop")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    patterns = load_patterns(args)
+    try:
+        compile_patterns(patterns)
+    except (ValueError, re.error) as exc:
+        raise SystemExit(f"Bad pattern: {exc}")
+
+    for path in args.paths:
+        if not os.path.isfile(path):
+            print(f"Error in {path}: File not found", file=sys.stderr)
+            continue
+        if args.benchmark:
+            run_benchmark(path, patterns, args.workers)
+            continue
+
+        totals: Counter = Counter()
+        started = time.perf_counter()
+        for counts, matches in scan_file(path, patterns, args.workers, args.count, args.chunk_mb * 1024 * 1024):
+            totals.update(counts)
+            for offset, name, line in matches:
+                print(f"{path}:{offset}:{name}: {line}")
+        elapsed = time.perf_counter() - started
+        size_mb = os.path.getsize(path) / 1_000_000
+        summary = ", ".join(f"{name}={totals[name]}" for name in patterns if totals[name])
+        print(f"{path}: {size_mb:.1f} MB in {elapsed:.2f}s ({size_mb / max(elapsed, 1e-9):.0f} MB/s): {summary or 'no matches'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Day 4 follow-up: load very large service inventories without reading them into memory.
+
+`function_refactor.py` reads the whole file with `read_text().splitlines()`
+and then joins every name into one string. That is fine for three services,
+but not for an inventory of hundreds of MB. The functions here:
+
+- memory-map the file and yield one line at a time,
+- drop duplicate services (and sort them if asked),
+- re-read only the bytes appended since the last load,
+- write the summary piece by piece instead of building one giant string.
+
+Usage example:
+    python3 inventory_loader.py services.txt
+    python3 inventory_loader.py services.txt --sort --summary-only
+    python3 inventory_loader.py services.txt --follow 2   # print services as they are appended
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+
+BLOCK_SIZE = 1 << 20
+
+
+def iter_blocks(path: Path, start: int = 0, complete_only: bool = False) -> Iterator[Tuple[List[str], int]]:
+    """
+    Yield (non-empty stripped lines, offset after them) for ~1 MB line-aligned blocks from `start`.
+
+    Splitting whole blocks is much faster than finding every newline from
+    Python. With `complete_only`, a last line without a newline is left alone
+    because it may still be being written.
+    """
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size <= start:
+            return  # mmap cannot map an empty range
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position < size:
+                end = mapped.rfind(b"\n", position, min(position + BLOCK_SIZE, size)) + 1
+                if end == 0:
+                    # No newline in this block: a very long line, or the unfinished last one.
+                    newline = mapped.find(b"\n", position)
+                    if newline == -1 and complete_only:
+                        return
+                    end = size if newline == -1 else newline + 1
+                if position + BLOCK_SIZE >= size and not complete_only:
+                    end = size
+                lines = [line.strip() for line in mapped[position:end].split(b"\n")]
+                position = end
+                yield [line.decode("utf-8", "replace") for line in lines if line], end
+
+
+def iter_lines(path: Path, start: int = 0) -> Iterator[str]:
+    """Yield each non-empty, stripped line of `path` from byte `start`."""
+    for lines, _ in iter_blocks(path, start):
+        yield from lines
+
+
+def load_services(path: Path, dedupe: bool = True, sort: bool = False) -> Iterator[str]:
+    """Yield services from `path`, optionally without duplicates and/or sorted."""
+    if sort:
+        # Sorting needs every name at once; deduping first keeps that list as small as possible.
+        names = set(iter_lines(path)) if dedupe else list(iter_lines(path))
+        yield from sorted(names)
+        return
+    seen: Set[str] = set()
+    for line in iter_lines(path):
+        if dedupe:
+            if line in seen:
+                continue
+            seen.add(line)
+        yield line
+
+
+class InventoryReader:
+    """Keeps the position in the file so `reload()` only parses what was appended."""
+
+    def __init__(self, path: Path, dedupe: bool = True) -> None:
+        self.path = path
+        self.dedupe = dedupe
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.seen: Set[str] = set()
+        self.count = 0
+
+    def reload(self) -> List[str]:
+        """Return the services added since the last call (everything on the first call)."""
+        stat = self.path.stat()
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # Replaced or truncated: the old offset means nothing any more.
+            self.inode, self.offset = stat.st_ino, 0
+            self.seen.clear()
+            self.count = 0
+        new: List[str] = []
+        for lines, end in iter_blocks(self.path, self.offset, complete_only=True):
+            self.offset = end
+            for line in lines:
+                if self.dedupe:
+                    if line in self.seen:
+                        continue
+                    self.seen.add(line)
+                new.append(line)
+        self.count += len(new)
+        return new
+
+
+def write_summary(services: Iterable[str], out: TextIO, separator: str = " | ") -> int:
+    """Write the uppercase services joined by `separator` as they come; returns how many were written."""
+    count = 0
+    for service in services:
+        if count:
+            out.write(separator)
+        out.write(service.upper())
+        count += 1
+    return count
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load a (large) service inventory, one service per line")
+    parser.add_argument("path", type=Path, nargs="?", default=Path("services.txt"), help="Inventory file (default: services.txt)")
+    parser.add_argument("--sort", action="store_true", help="Sort the services")
+    parser.add_argument("--keep-duplicates", action="store_true", help="Do not drop repeated services")
+    parser.add_argument("--summary-only", action="store_true", help="Print only the number of services")
+    parser.add_argument("--follow", type=float, metavar="SECONDS", help="Keep checking for appended services every SECONDS")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.path.exists():
+        print(f"{args.path} missing — create it with one service per line.")
+        return
+
+    if args.follow:
+        reader = InventoryReader(args.path, dedupe=not args.keep_duplicates)
+        try:
+            while True:
+                for service in reader.reload():
+                    print(service)
+                time.sleep(args.follow)
+        except KeyboardInterrupt:
+            print(f"Tracking {reader.count} services", file=sys.stderr)
+        return
+
+    services = load_services(args.path, dedupe=not args.keep_duplicates, sort=args.sort)
+    if args.summary_only:
+        print(f"Tracking {sum(1 for _ in services)} services")
+        return
+    sys.stdout.write("Services: ")
+    count = write_summary(services, sys.stdout)
+    print(f"\nTracking {count} services")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Parse server.conf-style files once and answer lookups from memory.
+
+`load_config(path)` returns a `ConfigIndex`: the keys in file order with
+their values, line numbers and byte offsets. Parsed files are memoized by
+(path, mtime, size), so a lookup on an unchanged file costs one `os.stat`.
+The least recently used entries are evicted once the cache is full.
+
+The byte offsets make same-length value changes cheap. `set_in_place`
+overwrites only the value bytes (e.g. `TIMEOUT = 30` -> `45`) instead of
+rewriting the file. Other changes go through `update_server_config`.
+
+Usage example:
+    python3 config_index.py server.conf
+    python3 config_index.py server.conf PORT SSL_ENABLED
+    python3 config_index.py server.conf --set TIMEOUT=45
+    python3 config_index.py server.conf --set TIMEOUT=45 --set PORT=9090 TIMEOUT PORT
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from update_server import CONFIG_LINE, parse_config_line, update_server_config
+
+CACHE_SIZE = 256
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True)
+class ConfigEntry:
+    key: str
+    value: str
+    line_number: int
+    offset: int  # byte offset of the first value byte
+    length: int  # value length in bytes
+
+
+class ConfigIndex:
+    """Ordered, typed view of one parsed config file."""
+
+    def __init__(self, path: str, mtime_ns: int, size: int, entries: "OrderedDict[str, ConfigEntry]") -> None:
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.entries = entries
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def as_dict(self) -> Dict[str, str]:
+        return {key: entry.value for key, entry in self.entries.items()}
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        entry = self.entries.get(key)
+        return entry.value if entry else default
+
+    def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        value = self.get(key)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{self.path}: {key}={value!r} is not an integer") from None
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        value = self.get(key)
+        if value is None:
+            return default
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"{self.path}: {key}={value!r} is not a boolean")
+
+    def get_path(self, key: str, default: Optional[Path] = None) -> Optional[Path]:
+        value = self.get(key)
+        return Path(value).expanduser() if value is not None else default
+
+
+def parse_config(path: str, stat: Optional[os.stat_result] = None) -> ConfigIndex:
+    """Parse `path` in one pass. Later duplicates of a key win, like most config readers."""
+    entries: "OrderedDict[str, ConfigEntry]" = OrderedDict()
+    offset = 0
+    with open(path, "rb") as handle:
+        stat = stat or os.fstat(handle.fileno())
+        for line_number, raw in enumerate(handle, start=1):
+            line = raw.decode("utf-8")
+            parsed = parse_config_line(line)
+            if parsed:
+                key, value = parsed
+                value_offset = offset + len(CONFIG_LINE.match(line).group(1).encode("utf-8"))
+                entries.pop(key, None)  # keep file order of the winning occurrence
+                entries[key] = ConfigEntry(key, value, line_number, value_offset, len(value.encode("utf-8")))
+            offset += len(raw)
+    return ConfigIndex(path, stat.st_mtime_ns, stat.st_size, entries)
+
+
+_cache: "OrderedDict[str, Tuple[int, int, ConfigIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def load_config(path: str) -> ConfigIndex:
+    """Return the parsed config, re-parsing only when the file's mtime or size changed."""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    with _cache_lock:
+        cached = _cache.get(real_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _cache.move_to_end(real_path)
+            return cached[2]
+
+    index = parse_config(real_path, stat)
+    with _cache_lock:
+        _cache[real_path] = (index.mtime_ns, index.size, index)
+        _cache.move_to_end(real_path)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def invalidate(path: Optional[str] = None) -> None:
+    """Forget one file (or everything) so the next `load_config` re-parses it."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.realpath(path), None)
+
+
+def set_in_place(path: str, key: str, value: str) -> bool:
+    """
+    Overwrite just the value bytes when the new value has the same length.
+
+    Returns False when that is not possible (different length, missing key,
+    or the file changed since it was indexed); use `update_server_config` then.
+    """
+    index = load_config(path)
+    entry = index.entries.get(key)
+    new_bytes = value.encode("utf-8")
+    if entry is None or len(new_bytes) != entry.length:
+        return False
+    with open(index.path, "r+b") as handle:
+        stat = os.fstat(handle.fileno())
+        handle.seek(entry.offset)
+        # Guard against edits made between indexing and opening the file.
+        if (stat.st_mtime_ns, stat.st_size) != (index.mtime_ns, index.size) or handle.read(entry.length) != entry.value.encode("utf-8"):
+            return False
+        handle.seek(entry.offset)
+        handle.write(new_bytes)
+        handle.flush()
+        os.fsync(handle.fileno())
+    invalidate(index.path)
+    return True
+
+
+def set_value(path: str, key: str, value: str) -> str:
+    """Change one key, in place when possible. Returns how the change was made."""
+    if set_in_place(path, key, value):
+        return "in-place"
+    changes = update_server_config(path, key, value)
+    invalidate(path)
+    return "rewritten" if changes else "unchanged"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Show or change values in a server.conf-style file")
+    parser.add_argument("path", help="Config file")
+    parser.add_argument("keys", nargs="*", help="Only show these keys")
+    parser.add_argument("--set", dest="updates", action="append", default=[], metavar="KEY=VALUE", help="Change a value (repeatable)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time N cached lookups against N fresh parses")
+    # Intermixed, so keys may also follow --set (plain parse_args rejects them as unrecognized).
+    return parser.parse_intermixed_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not os.path.exists(args.path):
+        raise SystemExit(f"File not found: {args.path}")
+
+    for pair in args.updates:
+        key, _, value = pair.partition("=")
+        print(f"{key}: {set_value(args.path, key.strip(), value.strip())}")
+
+    index = load_config(args.path)
+    for key in args.keys or index:
+        entry = index.entries.get(key)
+        if entry is None:
+            print(f"{key:<20} (not set)")
+        else:
+            print(f"{key:<20} {entry.value:<30} line {entry.line_number}, byte {entry.offset}")
+
+    if args.benchmark:
+        started = time.perf_counter()
+        for _ in range(args.benchmark):
+            parse_config(args.path).get("PORT")
+        parse_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(args.benchmark):
+            load_config(args.path).get("PORT")
+        cached_seconds = time.perf_counter() - started
+        print(
+            f"{args.benchmark} lookups: parse every time {parse_seconds * 1e6 / args.benchmark:.1f} us/op, "
+            f"cached {cached_seconds * 1e6 / args.benchmark:.1f} us/op"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Push the same key/value changes to every server.conf under a directory tree.
+
+Each file is handled by `update_server_config` from `update_server.py` on a
+pool of processes. A cheap read-only pass runs first, so files that already
+have the target values are never rewritten. At the end you get one line per
+file (changed / unchanged / error) and the total throughput.
+
+Usage example:
+    python3 config_rollout.py fleet/ --set MAX_CONNECTIONS=600
+    python3 config_rollout.py fleet/ --set PORT=9090 --set TIMEOUT=60 --pattern '*.conf' --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from update_server import parse_config_line, update_server_config
+
+
+@dataclass
+class FileResult:
+    path: str
+    status: str
+    changes: Dict[str, Tuple[Optional[str], str]] = field(default_factory=dict)
+    error: Optional[str] = None
+    size: int = 0
+
+
+def find_config_files(root: Path, pattern: str) -> Iterator[str]:
+    for directory, _, files in os.walk(root):
+        for name in fnmatch.filter(files, pattern):
+            yield os.path.join(directory, name)
+
+
+def pending_changes(path: str, updates: Dict[str, str]) -> Dict[str, Tuple[Optional[str], str]]:
+    """Return what `update_server_config` would change, reading the file once and writing nothing.
+
+    Like the updater, every occurrence of a key is checked, so a duplicated key
+    with one stale copy is reported too.
+    """
+    changes: Dict[str, Tuple[Optional[str], str]] = {}
+    found = set()
+    with open(path, "r", newline="") as handle:
+        for line in handle:
+            parsed = parse_config_line(line)
+            if parsed and parsed[0] in updates:
+                key, old_value = parsed
+                found.add(key)
+                if old_value != str(updates[key]):
+                    changes[key] = (old_value, str(updates[key]))
+    for key in updates:
+        if key not in found:
+            changes[key] = (None, str(updates[key]))
+    return changes
+
+
+def apply_to_file(path: str, updates: Dict[str, str], dry_run: bool) -> FileResult:
+    result = FileResult(path, "unchanged")
+    try:
+        result.size = os.path.getsize(path)
+        changes = pending_changes(path, updates)
+        if changes and not dry_run:
+            changes = update_server_config(path, updates)
+        if changes:
+            result.status, result.changes = "changed", changes
+    except (OSError, UnicodeDecodeError) as exc:
+        result.status, result.error = "error", str(exc)
+    return result
+
+
+def apply_batch(paths: List[str], updates: Dict[str, str], dry_run: bool) -> List[FileResult]:
+    return [apply_to_file(path, updates, dry_run) for path in paths]
+
+
+def batched(paths: Iterator[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_updates(pairs: List[str]) -> Dict[str, str]:
+    updates: Dict[str, str] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key.strip():
+            raise SystemExit(f"--set expects KEY=VALUE, got {pair!r}")
+        updates[key.strip()] = value.strip()
+    return updates
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply key/value changes to many server.conf files in parallel")
+    parser.add_argument("root", type=Path, help="Directory tree to search")
+    parser.add_argument("--set", dest="updates", action="append", required=True, metavar="KEY=VALUE", help="Change to apply (repeatable)")
+    parser.add_argument("--pattern", default="server.conf", help="File name pattern to match (default: server.conf)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Files handed to a worker at a time (default: 64)")
+    parser.add_argument("--report", type=Path, help="Also write the per-file results to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="Only print changed files and errors")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.root.is_dir():
+        raise SystemExit(f"Folder not found: {args.root}")
+    updates = parse_updates(args.updates)
+
+    results: List[FileResult] = []
+    started = time.perf_counter()
+    # Batches keep the per-task pickling overhead small when there are thousands of tiny files.
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [
+            pool.submit(apply_batch, batch, updates, args.dry_run)
+            for batch in batched(find_config_files(args.root, args.pattern), max(1, args.batch_size))
+        ]
+        for future in futures:
+            for result in future.result():
+                results.append(result)
+                if result.status == "changed":
+                    detail = ", ".join(f"{key}: {old} -> {new}" for key, (old, new) in result.changes.items())
+                    print(f"{'would change' if args.dry_run else 'changed':<13}{result.path}  {detail}")
+                elif result.status == "error":
+                    print(f"{'error':<13}{result.path}  {result.error}")
+                elif not args.quiet:
+                    print(f"{'unchanged':<13}{result.path}")
+    elapsed = time.perf_counter() - started
+
+    if args.report:
+        args.report.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+
+    counts = Counter(result.status for result in results)
+    total_mb = sum(result.size for result in results) / 1_000_000
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+    print(
+        f"Processed {len(results)} file(s) in {elapsed:.2f}s "
+        f"({len(results) / max(elapsed, 1e-9):.0f} files/s, {total_mb / max(elapsed, 1e-9):.1f} MB/s): {summary or 'no files found'}"
+    )
+    if counts["error"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
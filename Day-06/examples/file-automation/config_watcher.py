@@ -0,0 +1,278 @@
+"""Tell running code when a server.conf changes, down to which keys changed.
+
+One background thread watches any number of config files. On Linux it uses
+inotify through ctypes and watches each file's *directory*. That way the
+atomic rename done by `update_server_config` (temp file + `os.replace`)
+shows up as a `MOVED_TO` event for the file name, and the new inode is picked
+up automatically. Elsewhere, or with `backend="poll"`, it compares
+(inode, mtime, size) on an interval instead.
+
+On a change the file is dropped from the `config_index` cache and re-parsed
+on its own. Subscribers then get a `ConfigDiff` of added, removed and changed
+keys.
+
+Usage example:
+    python3 config_watcher.py server.conf
+    python3 config_watcher.py fleet/*/server.conf --poll 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config_index import invalidate, load_config
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+@dataclass
+class ConfigDiff:
+    path: str
+    added: Dict[str, str] = field(default_factory=dict)
+    removed: Dict[str, str] = field(default_factory=dict)
+    changed: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_configs(path: str, old: Dict[str, str], new: Dict[str, str]) -> ConfigDiff:
+    return ConfigDiff(
+        path,
+        added={k: v for k, v in new.items() if k not in old},
+        removed={k: v for k, v in old.items() if k not in new},
+        changed={k: (old[k], v) for k, v in new.items() if k in old and old[k] != v},
+    )
+
+
+def read_values(path: str) -> Dict[str, str]:
+    invalidate(path)
+    try:
+        return load_config(path).as_dict()
+    except FileNotFoundError:
+        return {}  # a deleted config looks like one with every key removed
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class Inotify:
+    """Minimal ctypes wrapper: directory watches and a non-blocking event reader."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch({directory}): {os.strerror(errno)}")
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+Subscriber = Callable[[ConfigDiff], None]
+
+
+class ConfigWatcher:
+    def __init__(self, paths: Optional[List[str]] = None, backend: str = "auto", poll_interval: float = 1.0) -> None:
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.values: Dict[str, Dict[str, str]] = {}
+        self.signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self.subscribers: List[Tuple[Optional[str], Subscriber]] = []
+        self.dir_watches: Dict[str, int] = {}
+        self.watched_names: Dict[int, Set[str]] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+        self.wake_read, self.wake_write = os.pipe()
+
+        self.inotify: Optional[Inotify] = None
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                self.inotify = Inotify()
+            except (OSError, AttributeError):
+                if backend == "inotify":
+                    raise
+        elif backend == "inotify":
+            raise OSError("inotify is only available on Linux")
+        self.backend = "inotify" if self.inotify else "poll"
+
+        for path in paths or []:
+            self.watch(path)
+
+    def watch(self, path: str) -> None:
+        path = os.path.realpath(path)
+        with self.lock:
+            if path in self.values:
+                return
+            self.values[path] = read_values(path)
+            self.signatures[path] = file_signature(path)
+            if self.inotify:
+                directory, name = os.path.split(path)
+                if directory not in self.dir_watches:
+                    wd = self.inotify.add_watch(directory)
+                    self.dir_watches[directory] = wd
+                    self.watched_names.setdefault(wd, set())
+                self.watched_names[self.dir_watches[directory]].add(name)
+
+    def subscribe(self, callback: Subscriber, path: Optional[str] = None) -> None:
+        """Call `callback(diff)` for changes to `path`, or to any watched file when `path` is None."""
+        with self.lock:
+            self.subscribers.append((os.path.realpath(path) if path else None, callback))
+
+    def reload(self, path: str) -> ConfigDiff:
+        new = read_values(path)
+        with self.lock:
+            old = self.values.get(path, {})
+            self.values[path] = new
+            self.signatures[path] = file_signature(path)
+            subscribers = [cb for target, cb in self.subscribers if target in (None, path)]
+        diff = diff_configs(path, old, new)
+        if diff:
+            for callback in subscribers:
+                try:
+                    callback(diff)
+                except Exception as exc:  # one broken subscriber must not stop the watcher
+                    print(f"config_watcher: subscriber failed for {path}: {exc}", file=sys.stderr)
+        return diff
+
+    def changed_paths_inotify(self) -> Set[str]:
+        ready, _, _ = select.select([self.inotify.fd, self.wake_read], [], [])
+        if self.wake_read in ready:
+            return set()
+        # Coalesce a burst of events into one reload per file.
+        time.sleep(0.01)
+        with self.lock:
+            directories = {wd: directory for directory, wd in self.dir_watches.items()}
+        paths: Set[str] = set()
+        for wd, mask, name in self.inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # The kernel dropped events; re-check everything.
+                with self.lock:
+                    return set(self.values)
+            with self.lock:
+                if name in self.watched_names.get(wd, ()):
+                    paths.add(os.path.join(directories[wd], name))
+        return paths
+
+    def changed_paths_poll(self) -> Set[str]:
+        ready, _, _ = select.select([self.wake_read], [], [], self.poll_interval)
+        if ready:
+            return set()
+        with self.lock:
+            known = dict(self.signatures)
+        return {path for path, signature in known.items() if file_signature(path) != signature}
+
+    def run(self) -> None:
+        poll = self.changed_paths_inotify if self.inotify else self.changed_paths_poll
+        while not self.stopping.is_set():
+            for path in poll():
+                self.reload(path)
+
+    def start(self) -> "ConfigWatcher":
+        self.thread = threading.Thread(target=self.run, name="config-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopping.set()
+        os.write(self.wake_write, b"x")
+        if self.thread:
+            self.thread.join()
+        if self.inotify:
+            self.inotify.close()
+        os.close(self.wake_read)
+        os.close(self.wake_write)
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def print_diff(diff: ConfigDiff) -> None:
+    stamp = time.strftime("%H:%M:%S")
+    for key, value in diff.added.items():
+        print(f"{stamp} {diff.path}: + {key}={value}")
+    for key, value in diff.removed.items():
+        print(f"{stamp} {diff.path}: - {key}={value}")
+    for key, (old, new) in diff.changed.items():
+        print(f"{stamp} {diff.path}: ~ {key}: {old} -> {new}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Print key-level changes to config files as they happen")
+    parser.add_argument("paths", nargs="+", help="Config files to watch")
+    parser.add_argument("--poll", type=float, metavar="SECONDS", help="Poll on this interval instead of using inotify")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"File not found: {', '.join(missing)}")
+
+    backend = "poll" if args.poll else "auto"
+    watcher = ConfigWatcher(args.paths, backend=backend, poll_interval=args.poll or 1.0)
+    watcher.subscribe(print_diff)
+    print(f"Watching {len(args.paths)} file(s) with {watcher.backend}; press Ctrl+C to stop")
+    with watcher:
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
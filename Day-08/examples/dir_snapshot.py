@@ -0,0 +1,288 @@
+"""Report what changed in a directory tree since the last run.
+
+The first run records every file's size, mtime and inode, plus each
+folder's mtime, in a SQLite snapshot. Later runs stat each folder first. A
+folder's mtime only changes when entries are created, deleted or renamed in
+it, so folders whose mtime is unchanged are not listed again. Their known
+subfolders are still visited, because a change deep down does not touch the
+parents' mtime. Only changed folders are re-read and compared. The output
+lists added (+), removed (-) and modified (~) files.
+
+Editing a file in place does not change its folder's mtime. Tools that write
+with a temp file + rename (as most build tools and `update_server_config` do)
+are always seen. Pass `--verify-files` to also re-stat the files in
+unchanged folders: still no folder listings, but one stat per file.
+
+Usage example:
+    python3 dir_snapshot.py /srv/artifacts                  # first run: build the snapshot
+    python3 dir_snapshot.py /srv/artifacts                  # later runs: print changes
+    python3 dir_snapshot.py /srv/artifacts --db artifacts.sqlite3 --verify-files
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+DEFAULT_DB = "dir_snapshot.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_by_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS dirs_by_parent ON dirs(parent);
+"""
+
+
+class FileInfo(NamedTuple):
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+class Change(NamedTuple):
+    kind: str  # "+", "-" or "~"
+    path: str
+    old: Optional[FileInfo]
+    new: Optional[FileInfo]
+
+
+@dataclass
+class FolderScan:
+    path: str
+    signature: Optional[Tuple[int, int]]  # (mtime_ns, inode); None when the folder is gone
+    listed: bool = False
+    files: Dict[str, FileInfo] = field(default_factory=dict)
+    subfolders: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def stat_info(stat: os.stat_result) -> FileInfo:
+    return FileInfo(stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def scan_folder(path: str, previous: Optional[Tuple[int, int]], known_files: Optional[List[str]]) -> FolderScan:
+    """List `path` only if its mtime/inode changed; otherwise optionally re-stat the known files."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return FolderScan(path, None, error="Folder not found")
+    except PermissionError:
+        return FolderScan(path, None, error="Permission denied")
+    result = FolderScan(path, (stat.st_mtime_ns, stat.st_ino))
+
+    if result.signature == previous:
+        for file_path in known_files or []:
+            try:
+                result.files[file_path] = stat_info(os.stat(file_path, follow_symlinks=False))
+            except FileNotFoundError:
+                pass
+        return result
+
+    result.listed = True
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        result.subfolders.append(entry.path)
+                    else:
+                        result.files[entry.path] = stat_info(entry.stat(follow_symlinks=False))
+                except FileNotFoundError:
+                    continue  # removed while we were scanning
+    except PermissionError:
+        result.error = "Permission denied"
+    return result
+
+
+class Snapshot:
+    def __init__(self, db_path: str) -> None:
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        self.dirs: Dict[str, Tuple[int, int]] = {}
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        for path, parent, mtime_ns, inode in self.conn.execute("SELECT path, parent, mtime_ns, inode FROM dirs"):
+            self.dirs[path] = (mtime_ns, inode)
+            if parent is not None:
+                self.children[parent].append(path)
+
+    def is_empty(self) -> bool:
+        return not self.dirs
+
+    def files_in(self, folder: str) -> Dict[str, FileInfo]:
+        rows = self.conn.execute("SELECT path, size, mtime_ns, inode FROM files WHERE dir = ?", (folder,))
+        return {path: FileInfo(size, mtime_ns, inode) for path, size, mtime_ns, inode in rows}
+
+    def save_folder(self, scan: FolderScan, parent: Optional[str]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns, inode) VALUES (?, ?, ?, ?)",
+            (scan.path, parent, *scan.signature),
+        )
+
+    def replace_files(self, folder: str, files: Dict[str, FileInfo]) -> None:
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (folder,))
+        self.conn.executemany(
+            "INSERT INTO files (path, dir, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?)",
+            ((path, folder, *info) for path, info in files.items()),
+        )
+
+    def update_files(self, files: Dict[str, FileInfo]) -> None:
+        self.conn.executemany(
+            "UPDATE files SET size = ?, mtime_ns = ?, inode = ? WHERE path = ?",
+            ((*info, path) for path, info in files.items()),
+        )
+
+    def remove_tree(self, folder: str) -> Iterator[Change]:
+        """Forget `folder` and everything below it, yielding a removal for each known file."""
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            stack.extend(self.children.pop(current, []))
+            for path, info in self.files_in(current).items():
+                yield Change("-", path, info, None)
+            self.conn.execute("DELETE FROM files WHERE dir = ?", (current,))
+            self.conn.execute("DELETE FROM dirs WHERE path = ?", (current,))
+            self.dirs.pop(current, None)
+
+
+def compare(old: Dict[str, FileInfo], new: Dict[str, FileInfo]) -> Iterator[Change]:
+    for path, info in new.items():
+        before = old.get(path)
+        if before is None:
+            yield Change("+", path, None, info)
+        elif before != info:
+            yield Change("~", path, before, info)
+    for path, info in old.items():
+        if path not in new:
+            yield Change("-", path, info, None)
+
+
+@dataclass
+class RunStats:
+    folders: int = 0
+    listed: int = 0
+    files_seen: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def rescan(snapshot: Snapshot, roots: Sequence[str], workers: int, verify_files: bool, stats: RunStats) -> Iterator[Change]:
+    """Walk the roots, update the snapshot and yield every change."""
+    def submit(pool: ThreadPoolExecutor, folder: str) -> Future:
+        previous = snapshot.dirs.get(folder)
+        known = list(snapshot.files_in(folder)) if verify_files and previous else None
+        return pool.submit(scan_folder, folder, previous, known)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        parents: Dict[Future, Optional[str]] = {submit(pool, os.path.abspath(root)): None for root in roots}
+        pending: Set[Future] = set(parents)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                parent = parents.pop(future)
+                scan = future.result()
+                stats.folders += 1
+                if scan.signature is None:
+                    if parent is None:
+                        # Keep the snapshot of a missing root: it is more likely unmounted than deleted.
+                        stats.errors.append(f"Error in {scan.path}: {scan.error}")
+                    else:
+                        yield from snapshot.remove_tree(scan.path)
+                    continue
+                if scan.error:
+                    stats.errors.append(f"Error in {scan.path}: {scan.error}")
+                    continue
+
+                if scan.listed:
+                    stats.listed += 1
+                    old_subfolders = set(snapshot.children.get(scan.path, []))
+                    for gone in old_subfolders - set(scan.subfolders):
+                        yield from snapshot.remove_tree(gone)
+                    snapshot.children[scan.path] = list(scan.subfolders)
+                    yield from compare(snapshot.files_in(scan.path), scan.files)
+                    snapshot.replace_files(scan.path, scan.files)
+                    subfolders = scan.subfolders
+                else:
+                    if verify_files:
+                        old = snapshot.files_in(scan.path)
+                        changed = {path: info for path, info in scan.files.items() if old.get(path) != info}
+                        yield from compare({path: old[path] for path in changed}, changed)
+                        snapshot.update_files(changed)
+                    subfolders = list(snapshot.children.get(scan.path, []))
+
+                stats.files_seen += len(scan.files)
+                snapshot.save_folder(scan, parent)
+                snapshot.dirs[scan.path] = scan.signature
+                for subfolder in subfolders:
+                    child = submit(pool, subfolder)
+                    parents[child] = scan.path
+                    pending.add(child)
+
+
+def describe(change: Change) -> str:
+    if change.kind == "~":
+        details = []
+        if change.old.size != change.new.size:
+            details.append(f"size {change.old.size} -> {change.new.size}")
+        if change.old.inode != change.new.inode:
+            details.append("replaced")
+        elif change.old.mtime_ns != change.new.mtime_ns:
+            details.append("touched")
+        return f"~ {change.path} ({', '.join(details)})"
+    return f"{change.kind} {change.path}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Show files added, removed or modified since the last snapshot")
+    parser.add_argument("folders", nargs="+", help="Folders to snapshot")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Snapshot database (default: {DEFAULT_DB})")
+    parser.add_argument("--workers", type=int, default=16, help="Folders read in parallel (default: 16)")
+    parser.add_argument("--verify-files", action="store_true", help="Also re-stat files in folders whose mtime did not change")
+    parser.add_argument("--summary", action="store_true", help="Only print the totals")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    snapshot = Snapshot(args.db)
+    first_run = snapshot.is_empty()
+    stats = RunStats()
+    counts = {"+": 0, "-": 0, "~": 0}
+
+    started = time.perf_counter()
+    with snapshot.conn:
+        for change in rescan(snapshot, args.folders, args.workers, args.verify_files, stats):
+            counts[change.kind] += 1
+            if not first_run and not args.summary:
+                print(describe(change))
+    elapsed = time.perf_counter() - started
+
+    for error in stats.errors:
+        print(error)
+    if first_run:
+        print(f"Snapshot created: {counts['+']} file(s) in {stats.folders} folder(s) in {elapsed:.2f}s ({args.db})")
+    else:
+        print(
+            f"{counts['+']} added, {counts['-']} removed, {counts['~']} modified; "
+            f"listed {stats.listed} of {stats.folders} folder(s) in {elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""Day 9 follow-up: one page loop for every kind of paginated API.
+
+`pagination_loop.paginate` chunks a list we already have. Real APIs hand out
+pages one request at a time and each tells you where the next one is in its
+own way. A *strategy* knows one of those ways:
+
+- `LinkHeaderStrategy`: GitHub style, `Link: <...>; rel="next"` header.
+- `CursorStrategy`: the body has a token for the next page (Jira `nextPageToken`, Slack `next_cursor`).
+- `OffsetStrategy`: `startAt`/`maxResults` plus a `total` in the body.
+- `BotoTokenStrategy`: AWS calls with `NextToken`-style tokens.
+
+`Paginator` runs a strategy. While your loop works on one page, the next
+`prefetch` pages are already being fetched on background threads. With
+offset/total every later page is known after the first one, so they are
+fetched in parallel. The other strategies only learn the next page from the
+current one, so they stay one request ahead. With `checkpoint=...` the
+cursor of the next page still to be processed is saved as soon as you call
+`commit()` after handling a page (or, at the latest, when you ask for the next
+page), and an interrupted crawl continues from there on the next run. A page
+that was handed out but never committed is handed out again after a resume.
+
+Usage example:
+    python3 paginator.py                                   # fake API: no prefetch vs prefetch
+    python3 paginator.py --strategy link --prefetch 4
+    python3 paginator.py --checkpoint crawl.json --stop-after 5   # run twice: the second run resumes
+    python3 paginator.py --github-user octocat
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from pagination_loop import paginate
+
+Cursor = Any  # whatever a strategy needs to request one page: a URL, a token, an offset, or None
+Fetched = Tuple[List[Any], List[Cursor]]  # (items on the page, cursors of pages found from it)
+
+
+def dig(data: Any, path: Optional[str]) -> Any:
+    """Follow a dotted key path such as "response_metadata.next_cursor"; None if any part is missing."""
+    if not path:
+        return data
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def with_query(url: str, params: Optional[Dict[str, Any]]) -> str:
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+class LinkHeaderStrategy:
+    """The next page's full URL is in the `Link` header (`response.links["next"]`)."""
+
+    def __init__(self, session, url: str, params: Optional[Dict[str, Any]] = None, items_key: Optional[str] = None) -> None:
+        self.session = session
+        self.url = with_query(url, params)
+        self.items_key = items_key
+
+    def key(self) -> str:
+        return f"link {self.url}"
+
+    def start(self) -> Cursor:
+        return self.url
+
+    def fetch(self, cursor: Cursor) -> Fetched:
+        response = self.session.get(cursor, timeout=30)
+        response.raise_for_status()
+        items = dig(response.json(), self.items_key) or []
+        next_url = response.links.get("next", {}).get("url")
+        return items, [next_url] if next_url else []
+
+
+class CursorStrategy:
+    """The body holds a token for the next page, sent back as `cursor_param`."""
+
+    def __init__(
+        self,
+        session,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        cursor_param: str = "cursor",
+        next_key: str = "next_cursor",
+        items_key: Optional[str] = "items",
+    ) -> None:
+        self.session = session
+        self.url = url
+        self.params = dict(params or {})
+        self.cursor_param = cursor_param
+        self.next_key = next_key
+        self.items_key = items_key
+
+    def key(self) -> str:
+        return f"cursor {with_query(self.url, self.params)}"
+
+    def start(self) -> Cursor:
+        return None
+
+    def fetch(self, cursor: Cursor) -> Fetched:
+        params = dict(self.params)
+        if cursor:
+            params[self.cursor_param] = cursor
+        response = self.session.get(self.url, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        next_cursor = dig(data, self.next_key)
+        return dig(data, self.items_key) or [], [next_cursor] if next_cursor else []
+
+
+class OffsetStrategy:
+    """`offset_param`/`limit_param` in the query and a total in the body, so every page is known up front."""
+
+    def __init__(
+        self,
+        session,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        offset_param: str = "startAt",
+        limit_param: str = "maxResults",
+        total_key: str = "total",
+        items_key: Optional[str] = "values",
+    ) -> None:
+        self.session = session
+        self.url = url
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.total_key = total_key
+        self.items_key = items_key
+
+    def key(self) -> str:
+        return f"offset {with_query(self.url, self.params)}"
+
+    def start(self) -> Cursor:
+        return 0
+
+    def fetch(self, cursor: Cursor) -> Fetched:
+        params = {**self.params, self.offset_param: cursor, self.limit_param: self.page_size}
+        response = self.session.get(self.url, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        items = dig(data, self.items_key) or []
+        total = dig(data, self.total_key)
+        # Step by what the server actually returned: many APIs cap the page size silently.
+        step = len(items)
+        if not step:
+            return items, []
+        if total is None:
+            return items, [cursor + step] if step >= self.page_size else []
+        return items, list(range(cursor + step, total, step))
+
+
+class BotoTokenStrategy:
+    """An AWS client call that returns a continuation token (`NextToken`, `NextContinuationToken`, ...)."""
+
+    def __init__(
+        self,
+        client,
+        operation: str,
+        result_key: str,
+        input_token: str = "NextToken",
+        output_token: str = "NextToken",
+        **params: Any,
+    ) -> None:
+        self.client = client
+        self.operation = operation
+        self.result_key = result_key
+        self.input_token = input_token
+        self.output_token = output_token
+        self.params = params
+
+    def key(self) -> str:
+        return f"boto {self.operation} {json.dumps(self.params, sort_keys=True, default=str)}"
+
+    def start(self) -> Cursor:
+        return None
+
+    def fetch(self, cursor: Cursor) -> Fetched:
+        params = dict(self.params)
+        if cursor:
+            params[self.input_token] = cursor
+        response = getattr(self.client, self.operation)(**params)
+        next_token = response.get(self.output_token)
+        return response.get(self.result_key, []), [next_token] if next_token else []
+
+
+class Page(NamedTuple):
+    number: int  # 1-based, counted across resumed runs
+    cursor: Cursor
+    items: List[Any]
+
+
+def load_checkpoint(path: str, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+    return state if state.get("key") == key else None  # a checkpoint of another crawl is ignored
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(temp_path, path)
+
+
+class Paginator:
+    def __init__(self, strategy, prefetch: int = 2, checkpoint: Optional[str] = None) -> None:
+        self.strategy = strategy
+        self.prefetch = max(0, prefetch)
+        self.checkpoint = checkpoint
+        self.start: Cursor = strategy.start()
+        self.pages_read = 0
+        self.items_read = 0
+        self.resumed = False
+        self.uncommitted: Optional[Tuple[bool, Cursor, int]] = None  # (more pages?, next cursor, items) of the last page handed out
+        if checkpoint:
+            state = load_checkpoint(checkpoint, strategy.key())
+            if state:
+                self.start = state["cursor"]
+                self.pages_read, self.items_read = state["pages"], state["items"]
+                self.resumed = True
+
+    def save(self, cursor: Cursor) -> None:
+        if self.checkpoint:
+            state = {"key": self.strategy.key(), "cursor": cursor, "pages": self.pages_read, "items": self.items_read}
+            save_checkpoint(self.checkpoint, state)
+
+    def commit(self) -> None:
+        """Mark the page last yielded by `pages()` as processed and move the checkpoint past it."""
+        if self.uncommitted is None:
+            return
+        has_next, next_cursor, count = self.uncommitted
+        self.uncommitted = None
+        self.pages_read += 1
+        self.items_read += count
+        if has_next:
+            self.save(next_cursor)
+        elif self.checkpoint and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)  # finished: the next run starts from the beginning
+
+    def pages(self) -> Iterator[Page]:
+        """Yield pages in order while up to `prefetch` later pages are fetched in the background."""
+        cursors: List[Cursor] = [self.start]
+        known = {self.start}
+        futures: Dict[int, Future] = {}
+        submitted = 0
+        current = 0
+        pool = ThreadPoolExecutor(max_workers=max(1, self.prefetch), thread_name_prefix="paginator")
+
+        def submit_ready(limit: int) -> None:
+            nonlocal submitted
+            while submitted < len(cursors) and submitted < limit:
+                futures[submitted] = pool.submit(self.strategy.fetch, cursors[submitted])
+                submitted += 1
+
+        try:
+            while current < len(cursors):
+                submit_ready(current + 1 + self.prefetch)
+                items, found = futures.pop(current).result()
+                for cursor in found:
+                    if cursor not in known:
+                        known.add(cursor)
+                        cursors.append(cursor)
+                page = Page(self.pages_read + 1, cursors[current], items)
+                current += 1
+                submit_ready(current + self.prefetch)  # start the next requests before handing this page out
+                has_next = current < len(cursors)
+                self.uncommitted = (has_next, cursors[current] if has_next else None, len(items))
+                yield page
+                # Asking for the next page means the caller is done with this one.
+                self.commit()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def items(self) -> Iterator[Any]:
+        for page in self.pages():
+            yield from page.items
+
+    def batches(self, size: int) -> Iterator[List[Any]]:
+        """Re-chunk the items into batches of `size`, whatever page size the API uses."""
+        return paginate(self.items(), size)
+
+
+class FakeResponse:
+    def __init__(self, data: Dict[str, Any], next_url: Optional[str]) -> None:
+        self.data = data
+        self.links = {"next": {"url": next_url}} if next_url else {}
+
+    def json(self) -> Dict[str, Any]:
+        return self.data
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Serves `range(1, total + 1)` in pages, with a delay per request, in all three HTTP styles at once."""
+
+    def __init__(self, total: int = 200, page_size: int = 10, latency: float = 0.2) -> None:
+        self.pages = list(paginate(range(1, total + 1), page_size))
+        self.total = total
+        self.page_size = page_size
+        self.latency = latency
+        self.requests = 0
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 0) -> FakeResponse:
+        self.requests += 1
+        time.sleep(self.latency)
+        query = {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+        query.update(params or {})
+        offset = int(query.get("startAt") or query.get("cursor") or 0)
+        items = self.pages[offset // self.page_size] if offset < self.total else []
+        following = offset + self.page_size
+        has_next = following < self.total
+        data = {"values": items, "total": self.total, "next_cursor": str(following) if has_next else None}
+        next_url = f"https://api.example.test/items?startAt={following}" if has_next else None
+        return FakeResponse(data, next_url)
+
+
+def fake_strategy(name: str, session: FakeSession):
+    url = "https://api.example.test/items"
+    if name == "link":
+        return LinkHeaderStrategy(session, url, items_key="values")
+    if name == "cursor":
+        return CursorStrategy(session, url, items_key="values")
+    return OffsetStrategy(session, url, page_size=session.page_size)
+
+
+def crawl(paginator: Paginator, work: float, stop_after: Optional[int] = None) -> int:
+    pages = 0
+    for page in paginator.pages():
+        time.sleep(work)  # pretend to process the page
+        paginator.commit()
+        pages += 1
+        if stop_after and pages >= stop_after:
+            break
+    return pages
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Prefetching, resumable paginator (demo against a fake API or GitHub)")
+    parser.add_argument("--strategy", choices=["offset", "link", "cursor"], default="offset", help="Fake API style (default: offset)")
+    parser.add_argument("--prefetch", type=int, default=4, help="Pages to fetch ahead of the one being processed (default: 4)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake seconds per request (default: 0.2)")
+    parser.add_argument("--work", type=float, default=0.1, help="Fake seconds to process each page (default: 0.1)")
+    parser.add_argument("--checkpoint", help="Save progress here and resume from it")
+    parser.add_argument("--stop-after", type=int, help="Stop after this many pages (to try resuming)")
+    parser.add_argument("--github-user", help="List this GitHub user's public repos instead of the fake API")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.github_user:
+        import requests
+
+        with requests.Session() as session:
+            strategy = LinkHeaderStrategy(session, f"https://api.github.com/users/{args.github_user}/repos", {"per_page": 100})
+            paginator = Paginator(strategy, args.prefetch, args.checkpoint)
+            for repo in paginator.items():
+                print(repo["full_name"])
+        print(f"{paginator.items_read} repos in {paginator.pages_read} page(s)")
+        return
+
+    if args.checkpoint or args.stop_after:
+        session = FakeSession(latency=args.latency)
+        paginator = Paginator(fake_strategy(args.strategy, session), args.prefetch, args.checkpoint)
+        print(f"{'Resuming at cursor ' + repr(paginator.start) if paginator.resumed else 'Starting from the first page'}")
+        pages = crawl(paginator, args.work, args.stop_after)
+        done = not (args.checkpoint and os.path.exists(args.checkpoint))
+        print(f"Processed {pages} page(s) this run, {paginator.items_read} items in total, {session.requests} request(s); {'finished' if done else 'checkpoint saved'}")
+        return
+
+    for prefetch in (0, args.prefetch):
+        session = FakeSession(latency=args.latency)
+        paginator = Paginator(fake_strategy(args.strategy, session), prefetch)
+        started = time.perf_counter()
+        pages = crawl(paginator, args.work)
+        elapsed = time.perf_counter() - started
+        print(f"{args.strategy:<6} prefetch={prefetch}: {pages} pages, {paginator.items_read} items in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
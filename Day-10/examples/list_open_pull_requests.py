@@ -7,16 +7,19 @@ Requires the `requests` library. For higher rate limits, supply a token via the
 from __future__ import annotations
 
 import os
-from typing import Dict
+from typing import Any, Dict, List
 
 import requests  # Library for making HTTP requests
 
 API_URL = "https://api.github.com/repos/kubernetes/kubernetes/pulls"
 
 
-def fetch_open_pull_requests(token: str | None = None) -> Dict[str, int]:
+def fetch_pull_request_list(token: str | None = None, api_url: str = API_URL, all_pages: bool = False) -> List[Dict[str, Any]]:
     """
-    Calls the GitHub API to get all open pull requests and counts them by author.
+    Calls the GitHub API and returns the open pull requests as a list of dictionaries.
+
+    By default this is the first page only (what GitHub returns for one request).
+    Pass all_pages=True to follow the 'Link' header through every page.
     """
     # Headers tell the API what format we want
     headers = {"Accept": "application/vnd.github+json"}
@@ -25,12 +28,35 @@ def fetch_open_pull_requests(token: str | None = None) -> Dict[str, int]:
     if token:
         headers["Authorization"] = f"Bearer {token}"
 
-    # Make a GET request to the API
-    response = requests.get(API_URL, headers=headers, timeout=15)
-    response.raise_for_status()  # Raise an error if the request failed
+    if not all_pages:
+        # Make a GET request to the API
+        response = requests.get(api_url, headers=headers, timeout=15)
+        response.raise_for_status()  # Raise an error if the request failed
+
+        # Convert the JSON response into a Python list
+        return response.json()
+
+    pull_requests: List[Dict[str, Any]] = []
+    url: str | None = api_url
+    params: Dict[str, Any] | None = {"state": "open", "per_page": 100}
+    while url:
+        response = requests.get(url, headers=headers, params=params, timeout=15)
+        response.raise_for_status()
+
+        # Convert the JSON response into a Python list and keep it
+        pull_requests.extend(response.json())
 
-    # Convert the JSON response into a Python list
-    pull_requests = response.json()
+        # GitHub puts the URL of the next page in the 'Link' header
+        url = response.links.get("next", {}).get("url")
+        params = None  # The 'next' URL already contains the query string
+    return pull_requests
+
+
+def fetch_open_pull_requests(token: str | None = None, api_url: str = API_URL) -> Dict[str, int]:
+    """
+    Calls the GitHub API to get all open pull requests and counts them by author.
+    """
+    pull_requests = fetch_pull_request_list(token, api_url)
     
     # Count how many PRs each person created
     creators: Dict[str, int] = {}
@@ -0,0 +1,251 @@
+"""Count open pull requests per creator from GitHub webhooks instead of polling.
+
+`list_open_pull_requests.py` asks GitHub for the full PR list every time. This
+script runs a tiny asyncio HTTP server that receives `pull_request` webhook
+events, checks their signature, and updates a SQLite store as PRs open and
+close. A one-time `backfill` seeds the store using the polling logic.
+
+Run with:
+  export GITHUB_WEBHOOK_SECRET=...   # same secret as in the webhook settings
+  python pr_webhook_receiver.py backfill --repo kubernetes/kubernetes
+  python pr_webhook_receiver.py serve --port 8080
+  curl http://127.0.0.1:8080/counts
+
+Test locally by replaying recorded deliveries against the running server:
+  python pr_webhook_receiver.py replay payloads/*.json --url http://127.0.0.1:8080/webhook
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from list_open_pull_requests import fetch_pull_request_list
+
+DEFAULT_DB = Path("pr_counts.sqlite3")
+MAX_BODY_BYTES = 25 * 1024 * 1024  # GitHub caps webhook payloads at 25 MB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS open_pulls (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    creator TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS open_pulls_creator ON open_pulls (creator);
+"""
+
+OPENING_ACTIONS = {"opened", "reopened"}
+CLOSING_ACTIONS = {"closed"}
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class PullRequestStore:
+    """Open PRs keyed by (repo, number), so redelivered events are harmless."""
+
+    def __init__(self, path: Path) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def apply_event(self, payload: Dict[str, Any]) -> bool:
+        action = payload.get("action")
+        pull = payload.get("pull_request") or {}
+        repo = (payload.get("repository") or {}).get("full_name")
+        if not repo or "number" not in pull:
+            return False
+
+        with self.connection:
+            if action in OPENING_ACTIONS:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO open_pulls (repo, number, creator) VALUES (?, ?, ?)",
+                    (repo, pull["number"], pull["user"]["login"]),
+                )
+                return True
+            if action in CLOSING_ACTIONS:
+                self.connection.execute("DELETE FROM open_pulls WHERE repo = ? AND number = ?", (repo, pull["number"]))
+                return True
+        return False
+
+    def replace_repo(self, repo: str, pulls: Iterable[Dict[str, Any]]) -> int:
+        rows = [(repo, pull["number"], pull["user"]["login"]) for pull in pulls]
+        with self.connection:
+            self.connection.execute("DELETE FROM open_pulls WHERE repo = ?", (repo,))
+            self.connection.executemany("INSERT INTO open_pulls (repo, number, creator) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def counts(self, repo: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT creator, COUNT(*) FROM open_pulls"
+        params: Tuple[Any, ...] = ()
+        if repo:
+            query += " WHERE repo = ?"
+            params = (repo,)
+        query += " GROUP BY creator ORDER BY COUNT(*) DESC, creator"
+        return dict(self.connection.execute(query, params).fetchall())
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    # compare_digest avoids leaking how many characters matched.
+    return bool(signature) and hmac.compare_digest(sign(secret, body), signature)
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    method, target, _version = request_line.split(" ", 2)
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in {"\r\n", "\n", ""}:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0"))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("payload too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def handle(store: PullRequestStore, secret: str, method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, Any]]:
+    url = urlsplit(target)
+
+    if url.path == "/counts":
+        if method != "GET":
+            return 405, {"error": "use GET"}
+        repo = parse_qs(url.query).get("repo", [None])[0]
+        return 200, {"repo": repo, "creators": store.counts(repo)}
+
+    if url.path == "/webhook":
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if not verify_signature(secret, body, headers.get("x-hub-signature-256")):
+            return 401, {"error": "bad signature"}
+        event = headers.get("x-github-event")
+        if event == "ping":
+            return 200, {"status": "pong"}
+        if event != "pull_request":
+            return 202, {"status": "ignored", "event": event}
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            return 400, {"error": "invalid JSON"}
+        applied = store.apply_event(payload)
+        return 200, {"status": "applied" if applied else "ignored", "action": payload.get("action")}
+
+    return 404, {"error": "not found"}
+
+
+async def serve(store: PullRequestStore, secret: str, host: str, port: int) -> None:
+    async def on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await read_request(reader)
+            except ValueError as exc:
+                status, payload = (413 if "too large" in str(exc) else 400), {"error": str(exc)}
+            except asyncio.IncompleteReadError:
+                status, payload = 400, {"error": "truncated body"}
+            else:
+                try:
+                    status, payload = handle(store, secret, method, target, headers, body)
+                except Exception as exc:  # keep serving; GitHub will show the failed delivery
+                    status, payload = 500, {"error": str(exc)}
+            write_response(writer, status, payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(on_connection, host, port)
+    print(f"Listening on http://{host}:{port} (POST /webhook, GET /counts)")
+    async with server:
+        await server.serve_forever()
+
+
+def backfill(store: PullRequestStore, repos: List[str], token: Optional[str]) -> None:
+    for repo in repos:
+        pulls = fetch_pull_request_list(token, f"https://api.github.com/repos/{repo}/pulls", all_pages=True)
+        print(f"Backfilled {repo}: {store.replace_repo(repo, pulls)} open PR(s)")
+
+
+def replay(paths: List[Path], url: str, secret: str, event: str) -> None:
+    session = requests.Session()
+    for path in paths:
+        body = path.read_bytes()
+        headers = {
+            "Content-Type": "application/json",
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": path.stem,
+            "X-Hub-Signature-256": sign(secret, body),
+        }
+        response = session.post(url, data=body, headers=headers, timeout=15)
+        print(f"{path.name}: {response.status_code} {response.text}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Event-driven pull request counts from GitHub webhooks")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"SQLite store (default: {DEFAULT_DB})")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET"), help="Webhook secret (defaults to GITHUB_WEBHOOK_SECRET env var)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the webhook receiver")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+
+    backfill_parser = subparsers.add_parser("backfill", help="Seed the store from the GitHub API once")
+    backfill_parser.add_argument("--repo", action="append", required=True, help="owner/name (repeatable)")
+    backfill_parser.add_argument("--token", default=os.getenv("GITHUB_TOKEN"))
+
+    replay_parser = subparsers.add_parser("replay", help="POST recorded payload files to a running receiver")
+    replay_parser.add_argument("payloads", nargs="+", type=Path, help="JSON files containing webhook bodies")
+    replay_parser.add_argument("--url", default="http://127.0.0.1:8080/webhook")
+    replay_parser.add_argument("--event", default="pull_request", help="Value for the X-GitHub-Event header")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command in {"serve", "replay"} and not args.secret:
+        raise SystemExit("Set GITHUB_WEBHOOK_SECRET environment variable or pass --secret")
+
+    if args.command == "replay":
+        replay(args.payloads, args.url, args.secret, args.event)
+        return
+
+    store = PullRequestStore(args.db)
+    if args.command == "backfill":
+        backfill(store, args.repo, args.token)
+    else:
+        try:
+            asyncio.run(serve(store, args.secret, args.host, args.port))
+        except KeyboardInterrupt:
+            print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
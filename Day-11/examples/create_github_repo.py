@@ -3,16 +3,22 @@
 This script is intentionally beginner-friendly: it uses the `requests` library,
 reads configuration from JSON or YAML, and supports dry-run / verbose modes so
 you can practice safely before automating production repositories.
+
+Pass `--reconcile` to compare the config against the live repository first and
+only send the writes that are actually needed (handy for nightly drift runs).
 """
 
 from __future__ import annotations
 
 import argparse
 import base64
+import hashlib
 import json
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
 
 import requests
 
@@ -23,6 +29,18 @@ except ImportError:  # pragma: no cover - optional dependency until installed
 
 GITHUB_API_BASE = "https://api.github.com"
 
+# Repository settings that can be changed with PATCH /repos/{owner}/{repo}.
+RECONCILED_SETTINGS = (
+    "description",
+    "homepage",
+    "private",
+    "visibility",
+    "has_issues",
+    "has_wiki",
+    "has_projects",
+    "delete_branch_on_merge",
+)
+
 
 class ConfigError(RuntimeError):
     """Raised when the configuration file is invalid."""
@@ -76,14 +94,18 @@ def repo_exists(session: requests.Session, owner: str, repo: str, headers: Dict[
     raise RuntimeError(f"Failed to determine repo status ({response.status_code}): {response.text}")
 
 
+def create_repo_url(config: Dict[str, Any]) -> str:
+    if config["owner_type"].lower() == "org":
+        return f"{GITHUB_API_BASE}/orgs/{config['owner']}/repos"
+    return f"{GITHUB_API_BASE}/user/repos"
+
+
 def create_repo(
     session: requests.Session,
     config: Dict[str, Any],
     headers: Dict[str, str],
     dry_run: bool = False,
 ) -> Dict[str, Any]:
-    owner = config["owner"]
-    owner_type = config["owner_type"].lower()
     payload = {
         "name": config["name"],
         "description": config.get("description", ""),
@@ -100,12 +122,7 @@ def create_repo(
     if dry_run:
         return {"dry_run": True, "payload": payload}
 
-    if owner_type == "org":
-        url = f"{GITHUB_API_BASE}/orgs/{owner}/repos"
-    else:
-        url = f"{GITHUB_API_BASE}/user/repos"
-
-    response = session.post(url, headers=headers, json=payload, timeout=15)
+    response = session.post(create_repo_url(config), headers=headers, json=payload, timeout=15)
     if response.status_code not in {201, 202}:
         raise RuntimeError(f"Repo creation failed ({response.status_code}): {response.text}")
     return response.json()
@@ -153,48 +170,226 @@ def ensure_files(
             raise RuntimeError(f"Failed to push {path} ({response.status_code}): {response.text}")
 
 
+@dataclass
+class PlannedCall:
+    method: str
+    url: str
+    reason: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+def git_blob_sha(content: str) -> str:
+    """Return the SHA git would assign to `content` as a blob."""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def desired_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    # Only reconcile keys the config actually sets, so unmanaged settings are left alone.
+    settings: Dict[str, Any] = {}
+    for key in RECONCILED_SETTINGS:
+        if key not in config:
+            continue
+        value = config[key]
+        settings[key] = value if key in {"description", "homepage", "visibility"} else bool(value)
+    return settings
+
+
+def fetch_repo(session: requests.Session, owner: str, repo: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    # One GET returns the settings *and* the topics list.
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
+    response = session.get(url, headers=headers, timeout=15)
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to fetch repo ({response.status_code}): {response.text}")
+    return response.json()
+
+
+def fetch_file_shas(
+    session: requests.Session,
+    owner: str,
+    repo: str,
+    branch: str,
+    paths: Iterable[str],
+    headers: Dict[str, str],
+) -> Dict[str, str]:
+    """Map each wanted path to its current blob SHA on `branch` (missing paths are omitted)."""
+    wanted = set(paths)
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{quote(branch, safe='')}"
+    response = session.get(url, headers=headers, params={"recursive": "1"}, timeout=30)
+    if response.status_code in {404, 409}:
+        # Unknown branch or empty repository: nothing exists yet.
+        return {}
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to read tree for {branch} ({response.status_code}): {response.text}")
+
+    tree = response.json()
+    shas = {entry["path"]: entry["sha"] for entry in tree.get("tree", []) if entry.get("type") == "blob" and entry["path"] in wanted}
+    if not tree.get("truncated"):
+        return shas
+
+    # Very large trees come back truncated; look up the leftovers one by one.
+    for path in wanted - shas.keys():
+        file_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}"
+        file_response = session.get(file_url, headers=headers, params={"ref": branch}, timeout=15)
+        if file_response.status_code == 200:
+            shas[path] = file_response.json()["sha"]
+        elif file_response.status_code != 404:
+            raise RuntimeError(f"Failed to inspect {path} ({file_response.status_code}): {file_response.text}")
+    return shas
+
+
+def plan_reconcile(
+    session: requests.Session,
+    config: Dict[str, Any],
+    actual: Dict[str, Any],
+    headers: Dict[str, str],
+    default_branch: str,
+) -> List[PlannedCall]:
+    owner = config["owner"]
+    repo = config["name"]
+    repo_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
+    plan: List[PlannedCall] = []
+
+    changed = {key: value for key, value in desired_settings(config).items() if actual.get(key) != value}
+    if changed:
+        plan.append(PlannedCall("PATCH", repo_url, f"settings differ: {', '.join(sorted(changed))}", changed))
+
+    topics = config.get("topics", [])
+    # GitHub stores topics in lowercase, so compare them that way.
+    if topics and sorted(t.lower() for t in topics) != sorted(t.lower() for t in actual.get("topics", [])):
+        plan.append(PlannedCall("PUT", f"{repo_url}/topics", "topics differ", {"names": list(topics)}))
+
+    files_by_branch: Dict[str, List[Dict[str, Any]]] = {}
+    for file_config in config.get("initial_files", []):
+        if not file_config.get("path") or file_config.get("content") is None:
+            raise ConfigError("Each file entry requires 'path' and 'content'.")
+        files_by_branch.setdefault(file_config.get("branch", default_branch), []).append(file_config)
+
+    for branch, files in files_by_branch.items():
+        current = fetch_file_shas(session, owner, repo, branch, (f["path"] for f in files), headers)
+        for file_config in files:
+            path = file_config["path"]
+            existing_sha = current.get(path)
+            if existing_sha == git_blob_sha(file_config["content"]):
+                continue
+            payload = {
+                "message": file_config.get("message", f"{'Update' if existing_sha else 'Add'} {path}"),
+                "content": base64.b64encode(file_config["content"].encode("utf-8")).decode("ascii"),
+                "branch": branch,
+            }
+            if existing_sha:
+                payload["sha"] = existing_sha
+            plan.append(PlannedCall("PUT", f"{repo_url}/contents/{path}", "file content differs" if existing_sha else "file missing", payload))
+
+    return plan
+
+
+def apply_plan(session: requests.Session, plan: Iterable[PlannedCall], headers: Dict[str, str], dry_run: bool, verbose: bool) -> None:
+    for call in plan:
+        if dry_run or verbose:
+            print(f"{'[dry-run] ' if dry_run else ''}{call.method} {call.url} ({call.reason})")
+        if dry_run:
+            continue
+        response = session.request(call.method, call.url, headers=headers, json=call.payload, timeout=15)
+        if response.status_code not in {200, 201}:
+            raise RuntimeError(f"{call.method} {call.url} failed ({response.status_code}): {response.text}")
+
+
+def reconcile_repo(
+    session: requests.Session,
+    config: Dict[str, Any],
+    headers: Dict[str, str],
+    dry_run: bool,
+    verbose: bool,
+) -> int:
+    """Bring one repository in line with its config and return the number of writes planned."""
+    owner = config["owner"]
+    repo_name = config["name"]
+    default_branch = config.get("default_branch", "main")
+
+    actual = fetch_repo(session, owner, repo_name, headers)
+    if actual is None and dry_run:
+        # Nothing exists yet, so the creation plus every topic and file would be written.
+        repo_url = f"{GITHUB_API_BASE}/repos/{owner}/{repo_name}"
+        plan = [PlannedCall("POST", create_repo_url(config), "repository missing")]
+        if config.get("topics"):
+            plan.append(PlannedCall("PUT", f"{repo_url}/topics", "repository missing"))
+        plan += [PlannedCall("PUT", f"{repo_url}/contents/{f.get('path')}", "repository missing") for f in config.get("initial_files", [])]
+        apply_plan(session, plan, headers, dry_run, verbose)
+        return len(plan)
+
+    created = actual is None
+    if created:
+        actual = create_repo(session, config, headers)
+        if verbose:
+            print(f"Created {owner}/{repo_name}")
+
+    plan = plan_reconcile(session, config, actual, headers, default_branch)
+    apply_plan(session, plan, headers, dry_run, verbose)
+    return len(plan) + created  # the creating POST is a write too, as in the dry-run count
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Create or update a GitHub repository from config")
-    parser.add_argument("--config", required=True, type=Path, help="Path to JSON or YAML config file")
+    parser.add_argument("--config", required=True, type=Path, nargs="+", help="Path(s) to JSON or YAML config files")
     parser.add_argument("--token", type=str, default=os.getenv("GITHUB_TOKEN"), help="GitHub personal access token (defaults to GITHUB_TOKEN env var)")
     parser.add_argument("--dry-run", action="store_true", help="Show what would happen without calling the API")
     parser.add_argument("--verbose", action="store_true", help="Log payloads and responses")
+    parser.add_argument("--reconcile", action="store_true", help="Diff against the live repo and only send the writes that are needed")
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-    token = args.token
-    if not token:
-        raise ConfigError("Provide a GitHub token via --token or the GITHUB_TOKEN environment variable.")
-
-    config = load_config(args.config)
+def provision_repo(session: requests.Session, config: Dict[str, Any], headers: Dict[str, str], dry_run: bool, verbose: bool) -> None:
     owner = config["owner"]
     repo_name = config["name"]
     default_branch = config.get("default_branch", "main")
 
-    headers = build_headers(token)
-    session = requests.Session()
-
     exists = repo_exists(session, owner, repo_name, headers)
-    if args.verbose:
+    if verbose:
         print(f"Repository exists: {exists}")
 
-    if exists and not args.dry_run:
-        if args.verbose:
+    if exists and not dry_run:
+        if verbose:
             print("Skipping creation; repository already exists.")
     else:
-        result = create_repo(session, config, headers, dry_run=args.dry_run)
-        if args.verbose:
+        result = create_repo(session, config, headers, dry_run=dry_run)
+        if verbose:
             print(json.dumps(result, indent=2, sort_keys=True, default=str))
 
     topics = config.get("topics", [])
-    update_topics(session, owner, repo_name, topics, headers, args.dry_run)
+    update_topics(session, owner, repo_name, topics, headers, dry_run)
 
     initial_files = config.get("initial_files", [])
-    ensure_files(session, owner, repo_name, initial_files, headers, default_branch, args.dry_run)
+    ensure_files(session, owner, repo_name, initial_files, headers, default_branch, dry_run)
+
+
+def main() -> None:
+    args = parse_args()
+    token = args.token
+    if not token:
+        raise ConfigError("Provide a GitHub token via --token or the GITHUB_TOKEN environment variable.")
+
+    configs = [load_config(path) for path in args.config]
+    headers = build_headers(token)
+    session = requests.Session()
 
-    print(f"Repository ready: https://github.com/{owner}/{repo_name}")
+    total_writes = 0
+    for config in configs:
+        owner = config["owner"]
+        repo_name = config["name"]
+        if args.reconcile:
+            writes = reconcile_repo(session, config, headers, args.dry_run, args.verbose)
+            total_writes += writes
+            status = "in sync" if writes == 0 else f"{writes} change(s) {'planned' if args.dry_run else 'applied'}"
+            print(f"Repository {status}: https://github.com/{owner}/{repo_name}")
+        else:
+            provision_repo(session, config, headers, args.dry_run, args.verbose)
+            print(f"Repository ready: https://github.com/{owner}/{repo_name}")
+
+    if args.reconcile and len(configs) > 1:
+        print(f"Reconciled {len(configs)} repositories with {total_writes} write call(s).")
 
 
 if __name__ == "__main__":
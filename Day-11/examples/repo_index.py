@@ -0,0 +1,212 @@
+"""Keep a local SQLite index of repositories for one or more GitHub owners.
+
+`list_repos.py` walks every page of the listing on each run. This script syncs
+the listing into a SQLite file instead: the first sync is a full walk, later
+syncs ask GitHub for repos sorted by `updated` and stop as soon as they reach
+the previous run's watermark. Queries are then answered locally.
+
+Run with:
+  export GITHUB_TOKEN=...  # with repo scope
+  python repo_index.py sync --owner platform-org --owner data-org
+  python repo_index.py list --filter visibility=private --filter archived=false
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from create_github_repo import GITHUB_API_BASE, build_headers
+
+DEFAULT_DB = Path("repo_index.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    full_name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    name TEXT NOT NULL,
+    visibility TEXT,
+    private INTEGER,
+    archived INTEGER,
+    fork INTEGER,
+    language TEXT,
+    default_branch TEXT,
+    topics TEXT,
+    updated_at TEXT,
+    pushed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS repos_owner ON repos (owner);
+CREATE TABLE IF NOT EXISTS sync_state (
+    owner TEXT PRIMARY KEY,
+    owner_type TEXT NOT NULL,
+    watermark TEXT
+);
+"""
+
+# Columns that `--filter key=value` may use; booleans are stored as 0/1.
+FILTER_COLUMNS = {"owner", "name", "visibility", "private", "archived", "fork", "language", "default_branch"}
+BOOLEAN_COLUMNS = {"private", "archived", "fork"}
+
+
+def open_index(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_watermark(connection: sqlite3.Connection, owner: str) -> Optional[str]:
+    row = connection.execute("SELECT watermark FROM sync_state WHERE owner = ?", (owner,)).fetchone()
+    return row[0] if row else None
+
+
+def authenticated_login(session: requests.Session, headers: Dict[str, str]) -> str:
+    response = session.get(f"{GITHUB_API_BASE}/user", headers=headers, timeout=15)
+    response.raise_for_status()
+    return response.json()["login"]
+
+
+def iter_updated_repos(
+    session: requests.Session,
+    owner: str,
+    owner_type: str,
+    headers: Dict[str, str],
+    watermark: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    """Yield `owner`'s repos newest-update first, stopping once they are older than `watermark`."""
+    params: Optional[Dict[str, Any]] = {"per_page": 100, "sort": "updated", "direction": "desc"}
+    if owner_type == "org":
+        url: Optional[str] = f"{GITHUB_API_BASE}/orgs/{owner}/repos"
+    elif owner.lower() == authenticated_login(session, headers).lower():
+        # Only /user/repos includes the token owner's private repos; limit it to repos they own.
+        url = f"{GITHUB_API_BASE}/user/repos"
+        params["affiliation"] = "owner"
+    else:
+        url = f"{GITHUB_API_BASE}/users/{owner}/repos"
+
+    while url:
+        response = session.get(url, headers=headers, params=params, timeout=15)
+        response.raise_for_status()
+        for repo in response.json():
+            # ISO-8601 timestamps in UTC compare correctly as strings.
+            if watermark and repo["updated_at"] < watermark:
+                return
+            # Rows, the full-sync delete and the watermark must all be about this one owner.
+            if repo["owner"]["login"].lower() == owner.lower():
+                yield repo
+        url = response.links.get("next", {}).get("url")
+        params = None
+
+
+def fetch_owner(owner: str, owner_type: str, token: str, watermark: Optional[str]) -> Tuple[str, List[Dict[str, Any]]]:
+    # Each worker thread gets its own session; requests sessions are not thread-safe.
+    with requests.Session() as session:
+        return owner, list(iter_updated_repos(session, owner, owner_type, build_headers(token), watermark))
+
+
+def to_row(repo: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        repo["full_name"],
+        repo["owner"]["login"],
+        repo["name"],
+        repo.get("visibility", "private" if repo.get("private") else "public"),
+        int(bool(repo.get("private"))),
+        int(bool(repo.get("archived"))),
+        int(bool(repo.get("fork"))),
+        repo.get("language"),
+        repo.get("default_branch"),
+        json.dumps(repo.get("topics", [])),
+        repo.get("updated_at"),
+        repo.get("pushed_at"),
+    )
+
+
+def store_owner(connection: sqlite3.Connection, owner: str, owner_type: str, repos: List[Dict[str, Any]], full: bool) -> None:
+    with connection:
+        if full:
+            # A full walk is authoritative, so drop repos that were deleted or transferred.
+            connection.execute("DELETE FROM repos WHERE owner = ? COLLATE NOCASE", (owner,))
+        connection.executemany(
+            "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (to_row(repo) for repo in repos),
+        )
+        watermark = max((repo["updated_at"] for repo in repos), default=get_watermark(connection, owner))
+        connection.execute(
+            "INSERT OR REPLACE INTO sync_state (owner, owner_type, watermark) VALUES (?, ?, ?)",
+            (owner, owner_type, watermark),
+        )
+
+
+def sync(connection: sqlite3.Connection, owners: List[str], owner_type: str, token: str, full: bool, workers: int) -> None:
+    watermarks = {owner: None if full else get_watermark(connection, owner) for owner in owners}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(owners)))) as pool:
+        futures = [pool.submit(fetch_owner, owner, owner_type, token, watermarks[owner]) for owner in owners]
+        for future in as_completed(futures):
+            owner, repos = future.result()
+            # SQLite writes stay on the main thread.
+            store_owner(connection, owner, owner_type, repos, full or watermarks[owner] is None)
+            mode = "full" if full or watermarks[owner] is None else f"since {watermarks[owner]}"
+            print(f"Synced {owner}: {len(repos)} repo(s) fetched ({mode})")
+
+
+def parse_filters(filters: List[str]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    values: List[Any] = []
+    for item in filters:
+        key, sep, value = item.partition("=")
+        if not sep or key not in FILTER_COLUMNS:
+            raise SystemExit(f"Invalid filter {item!r}; use key=value with key in {', '.join(sorted(FILTER_COLUMNS))}")
+        clauses.append(f"{key} = ?")
+        values.append(int(value.lower() in {"1", "true", "yes"}) if key in BOOLEAN_COLUMNS else value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", values
+
+
+def list_index(connection: sqlite3.Connection, filters: List[str]) -> None:
+    where, values = parse_filters(filters)
+    query = f"SELECT full_name, visibility FROM repos{where} ORDER BY full_name"
+    count = 0
+    for full_name, visibility in connection.execute(query, values):
+        print(f"{full_name}  |  visibility={visibility}")
+        count += 1
+    print(f"{count} repo(s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync and query a local GitHub repository index")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"SQLite index file (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Fetch new or updated repos into the index")
+    sync_parser.add_argument("--owner", action="append", required=True, help="GitHub login or organization (repeatable)")
+    sync_parser.add_argument("--owner-type", choices=("user", "org"), default="org")
+    sync_parser.add_argument("--token", default=os.getenv("GITHUB_TOKEN"))
+    sync_parser.add_argument("--full", action="store_true", help="Ignore watermarks and rebuild the owners from scratch")
+    sync_parser.add_argument("--workers", type=int, default=8, help="Owners synced in parallel")
+
+    list_parser = subparsers.add_parser("list", help="Query the local index")
+    list_parser.add_argument("--filter", action="append", default=[], help="key=value filter, e.g. visibility=private (repeatable)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    connection = open_index(args.db)
+    try:
+        if args.command == "sync":
+            if not args.token:
+                raise SystemExit("Set GITHUB_TOKEN environment variable or pass --token")
+            sync(connection, args.owner, args.owner_type, args.token, args.full, args.workers)
+        else:
+            list_index(connection, args.filter)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Trigger Jenkins builds and wait for all of them to finish.
+
+`trigger` POSTs a build for every job (with the usual crumb handling) and
+follows each queue item until Jenkins assigns a build number. `watch` polls
+the builds concurrently: intervals adapt to each build's estimated duration
+and back off while nothing changes, responses are trimmed with `tree=`, and
+`If-None-Match` is sent whenever Jenkins returned an ETag.
+
+Usage example:
+    python jenkins_builds.py trigger platform/services/sample-service-ci platform/infra/terraform-plan --wait
+    python jenkins_builds.py watch platform/services/sample-service-ci:42 platform/infra/terraform-plan
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from jenkins_bulk_provisioner import build_session
+from jenkins_job_provisioner import ConfigError, build_job_path, fetch_crumb
+
+QUEUE_TREE = "cancelled,why,executable[number,url]"
+BUILD_TREE = "number,url,building,result,duration,estimatedDuration,timestamp"
+
+
+@dataclass
+class TrackedBuild:
+    job: str
+    queue_url: Optional[str] = None
+    build_url: Optional[str] = None
+    number: Optional[int] = None
+    result: Optional[str] = None
+    estimated_ms: int = -1
+    started_ms: int = 0
+    duration_ms: int = 0
+    etag: Optional[str] = None
+    interval: float = 0.0
+    next_poll: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+
+def job_url(base_url: str, job: str) -> str:
+    folder, _, name = job.strip("/").rpartition("/")
+    return build_job_path(base_url, folder or None, name)
+
+
+def trigger_build(
+    session: requests.Session,
+    base_url: str,
+    job: str,
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    crumb: Optional[Dict[str, str]],
+    params: Dict[str, str],
+) -> TrackedBuild:
+    endpoint = "buildWithParameters" if params else "build"
+    post_headers = {**headers, **(crumb or {})}
+    response = session.post(f"{job_url(base_url, job)}/{endpoint}", headers=post_headers, auth=auth, params=params or None, timeout=20)
+    if response.status_code not in {200, 201}:
+        return TrackedBuild(job, result="ERROR", error=f"trigger failed: {response.status_code} {response.text[:200]}")
+    # Jenkins answers with the queue item URL; the build number is only known once it leaves the queue.
+    queue_url = response.headers.get("Location")
+    if not queue_url:
+        return TrackedBuild(job, result="ERROR", error="trigger response had no queue Location header")
+    return TrackedBuild(job, queue_url=queue_url)
+
+
+def next_interval(build: TrackedBuild, changed: bool, min_interval: float, max_interval: float) -> float:
+    if changed or not build.interval:
+        return min_interval
+    if build.build_url and build.estimated_ms > 0:
+        # Poll more often as the build approaches its usual duration.
+        remaining = (build.started_ms + build.estimated_ms) / 1000 - time.time()
+        return min(max(remaining / 2, min_interval), max_interval)
+    return min(build.interval * 1.5, max_interval)
+
+
+def poll_once(
+    session: requests.Session,
+    build: TrackedBuild,
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    min_interval: float,
+    max_interval: float,
+) -> Optional[str]:
+    """Advance one build by a single GET and return a progress message when its state changed."""
+    message: Optional[str] = None
+    try:
+        if build.build_url is None:
+            url, tree = f"{build.queue_url.rstrip('/')}/api/json", QUEUE_TREE
+        else:
+            url, tree = f"{build.build_url.rstrip('/')}/api/json", BUILD_TREE
+        request_headers = {**headers, "If-None-Match": build.etag} if build.etag else headers
+        response = session.get(url, headers=request_headers, auth=auth, params={"tree": tree}, timeout=15)
+
+        if response.status_code == 304:
+            changed = False
+        elif response.status_code == 429 or response.status_code >= 500:
+            # Jenkins busy or restarting: back off like a network error and let --timeout decide.
+            changed, message = False, f"{build.job}: poll got {response.status_code}, retrying"
+        elif response.status_code != 200:
+            build.result, build.error = "ERROR", f"poll failed: {response.status_code}"
+            return f"{build.job}: {build.error}"
+        else:
+            build.etag = response.headers.get("ETag")
+            data = response.json()
+            changed = False
+            if build.build_url is None:
+                if data.get("cancelled"):
+                    build.result = "CANCELLED"
+                    return f"{build.job}: cancelled while queued"
+                executable = data.get("executable")
+                if executable:
+                    build.build_url, build.number, build.etag = executable["url"], executable["number"], None
+                    changed = True
+                    message = f"{build.job}: started #{build.number}"
+            else:
+                # Pin `lastBuild` targets to the concrete build so a newer run is not picked up.
+                build.build_url, build.number = data.get("url", build.build_url), data.get("number", build.number)
+                build.estimated_ms = data.get("estimatedDuration", -1)
+                build.started_ms = data.get("timestamp", 0)
+                if not data.get("building") and data.get("result"):
+                    build.result = data["result"]
+                    build.duration_ms = data.get("duration", 0)
+                    return f"{build.job} #{build.number}: {build.result}"
+    except requests.RequestException as exc:
+        # Transient network errors just push the next poll back.
+        changed, message = False, f"{build.job}: poll error ({exc}), retrying"
+
+    build.interval = next_interval(build, changed, min_interval, max_interval)
+    build.next_poll = time.monotonic() + build.interval
+    return message
+
+
+def watch(
+    session: requests.Session,
+    builds: List[TrackedBuild],
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    workers: int,
+    min_interval: float,
+    max_interval: float,
+    timeout: Optional[float],
+) -> None:
+    deadline = time.monotonic() + timeout if timeout else None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            pending = [b for b in builds if not b.done]
+            if not pending:
+                return
+            now = time.monotonic()
+            if deadline and now >= deadline:
+                for build in pending:
+                    build.result, build.error = "TIMEOUT", "gave up waiting"
+                return
+            due = [b for b in pending if b.next_poll <= now]
+            for message in pool.map(lambda b: poll_once(session, b, headers, auth, min_interval, max_interval), due):
+                if message:
+                    print(message)
+            # Sleep until the earliest build is due again (or the deadline, if sooner) instead of spinning.
+            upcoming = [b.next_poll for b in builds if not b.done]
+            if upcoming:
+                wake = min(min(upcoming), deadline) if deadline else min(upcoming)
+                time.sleep(max(0.0, wake - time.monotonic()))
+
+
+def parse_watch_target(base_url: str, target: str) -> TrackedBuild:
+    """`folder/job:42` watches build 42; a bare job watches its last build."""
+    job, _, number = target.partition(":")
+    suffix = number or "lastBuild"
+    return TrackedBuild(job, build_url=f"{job_url(base_url, job)}/{suffix}/", number=int(number) if number else None)
+
+
+def print_summary(builds: List[TrackedBuild]) -> int:
+    width = max((len(b.job) for b in builds), default=3)
+    failed = 0
+    for build in builds:
+        if build.result != "SUCCESS":
+            failed += 1
+        number = f"#{build.number}" if build.number else "-"
+        detail = build.error or f"{build.duration_ms / 1000:.0f}s"
+        print(f"{build.job:<{width}}  {number:>6}  {build.result or '-':<10}  {detail}")
+    print(f"{len(builds) - failed}/{len(builds)} build(s) succeeded")
+    return 1 if failed else 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Trigger Jenkins builds and wait for their results")
+    parser.add_argument("--url", default=os.getenv("JENKINS_URL"), help="Base Jenkins URL (defaults to JENKINS_URL env var)")
+    parser.add_argument("--user", default=os.getenv("JENKINS_USER"), help="Jenkins username (defaults to JENKINS_USER env var)")
+    parser.add_argument("--token", default=os.getenv("JENKINS_TOKEN"), help="Jenkins API token or password (defaults to JENKINS_TOKEN env var)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent API calls (default: 16)")
+    parser.add_argument("--min-interval", type=float, default=2.0, help="Shortest delay between polls of one build, in seconds")
+    parser.add_argument("--max-interval", type=float, default=30.0, help="Longest delay between polls of one build, in seconds")
+    parser.add_argument("--timeout", type=float, help="Give up after this many seconds")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    trigger_parser = subparsers.add_parser("trigger", help="Start builds")
+    trigger_parser.add_argument("jobs", nargs="*", help="Job paths such as platform/services/sample-service-ci")
+    trigger_parser.add_argument("--jobs-file", type=Path, help="File with one job path per line")
+    trigger_parser.add_argument("--param", action="append", default=[], help="Build parameter KEY=VALUE (repeatable)")
+    trigger_parser.add_argument("--wait", action="store_true", help="Watch the triggered builds until they finish")
+
+    watch_parser = subparsers.add_parser("watch", help="Wait for running builds")
+    watch_parser.add_argument("targets", nargs="+", help="job or job:build_number")
+    return parser.parse_args()
+
+
+def split_params(items: List[str]) -> Dict[str, str]:
+    params: Dict[str, str] = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ConfigError(f"Build parameters must look like KEY=VALUE, got {item!r}")
+        params[key] = value
+    return params
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.user or not args.token:
+        raise ConfigError("Provide Jenkins URL, user, and token via arguments or environment variables.")
+
+    workers = max(1, args.workers)
+    session = build_session(workers)
+    auth = requests.auth.HTTPBasicAuth(args.user, args.token)
+    headers = {"User-Agent": "python-devops-launchpad"}
+
+    if args.command == "trigger":
+        jobs = list(args.jobs)
+        if args.jobs_file:
+            jobs += [line.strip() for line in args.jobs_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+        if not jobs:
+            raise ConfigError("Name at least one job or pass --jobs-file.")
+        params = split_params(args.param)
+        crumb = fetch_crumb(session, args.url, auth)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            builds = list(pool.map(lambda job: trigger_build(session, args.url, job, headers, auth, crumb, params), jobs))
+        for build in builds:
+            print(f"{build.job}: {build.error or 'queued ' + str(build.queue_url)}")
+        if not args.wait:
+            raise SystemExit(1 if any(b.error for b in builds) else 0)
+    else:
+        builds = [parse_watch_target(args.url, target) for target in args.targets]
+
+    watch(session, builds, headers, auth, workers, args.min_interval, args.max_interval, args.timeout)
+    raise SystemExit(print_summary(builds))
+
+
+if __name__ == "__main__":
+    main()
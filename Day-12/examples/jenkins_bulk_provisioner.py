@@ -0,0 +1,255 @@
+"""Provision many Jenkins pipeline jobs in parallel.
+
+`jenkins_job_provisioner.py` handles one job per run. This script accepts a
+YAML file containing a list of job specs (or a `jobs:` list plus shared
+`defaults:`), or a directory of such files, and applies them with a thread
+pool. Folders are created level by level so parents always exist before
+their children, while siblings are created in parallel. Every worker shares
+one `requests.Session` and the crumb fetched for it, because Jenkins binds
+crumbs to the session cookie.
+
+Usage example:
+    python jenkins_bulk_provisioner.py --config jobs/ --workers 16 --report apply-report.json
+    python jenkins_bulk_provisioner.py --config jobs/ --templates templates.yaml --render-all plan/
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from jenkins_job_provisioner import (
+    ConfigError,
+    ConfigHashCache,
+    JenkinsItemIndex,
+    create_or_update_job,
+    ensure_folder,
+    fetch_crumb,
+    item_path,
+    validate_job_config,
+    yaml,
+)
+from jenkins_templates import RESERVED_KEYS, TemplateRegistry
+
+
+@dataclass
+class JobResult:
+    job: str
+    action: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def load_job_specs(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        raise ConfigError(f"Config path not found: {path}")
+    if yaml is None:
+        raise ConfigError("PyYAML is required for YAML configs. Install with `pip install pyyaml`.")
+
+    files = sorted([*path.glob("*.yaml"), *path.glob("*.yml")]) if path.is_dir() else [path]
+    specs: List[Dict[str, Any]] = []
+    for file in files:
+        data = yaml.safe_load(file.read_text(encoding="utf-8"))
+        defaults: Dict[str, Any] = {}
+        if isinstance(data, dict) and "jobs" in data:
+            defaults = data.get("defaults") or {}
+            data = data["jobs"]
+        entries = data if isinstance(data, list) else [data]
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ConfigError(f"{file}: every job spec must be a mapping/dictionary.")
+            validate_job_config({**defaults, **entry})
+            # Structural keys are inherited directly; values stay a separate layer that
+            # TemplateRegistry.resolve ranks below folder overrides.
+            spec = {key: value for key, value in defaults.items() if key in RESERVED_KEYS}
+            spec.update(entry)
+            values = {key: value for key, value in defaults.items() if key not in RESERVED_KEYS}
+            if values:
+                spec["defaults"] = values
+            specs.append(spec)
+
+    counts = Counter(item_path(spec.get("folder"), spec["job_name"]) for spec in specs)
+    duplicates = sorted(path for path, count in counts.items() if count > 1)
+    if duplicates:
+        raise ConfigError(f"Duplicate job definitions: {', '.join(duplicates)}")
+    return specs
+
+
+def folder_levels(specs: List[Dict[str, Any]]) -> List[List[str]]:
+    """Group every folder (including ancestors) by depth: parents come in earlier levels."""
+    levels: Dict[int, set] = {}
+    for spec in specs:
+        parts = [p for p in (spec.get("folder") or "").split("/") if p]
+        for depth in range(1, len(parts) + 1):
+            levels.setdefault(depth, set()).add("/".join(parts[:depth]))
+    return [sorted(levels[depth]) for depth in sorted(levels)]
+
+
+def build_session(workers: int) -> requests.Session:
+    session = requests.Session()
+    # One connection per worker so threads do not queue for a socket.
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def apply_job(
+    session: requests.Session,
+    base_url: str,
+    spec: Dict[str, Any],
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    crumb: Optional[Dict[str, str]],
+    index: Optional[JenkinsItemIndex],
+    hash_cache: Optional[ConfigHashCache],
+    compare: bool,
+    templates: TemplateRegistry,
+) -> JobResult:
+    name = item_path(spec.get("folder"), spec["job_name"])
+    started = time.perf_counter()
+    try:
+        action = create_or_update_job(session, base_url, spec, headers, auth, crumb, False, index, hash_cache, compare, templates)
+    except Exception as exc:  # keep going; failures are collected in the report
+        return JobResult(name, "failed", time.perf_counter() - started, str(exc))
+    return JobResult(name, action, time.perf_counter() - started)
+
+
+def apply_all(
+    session: requests.Session,
+    base_url: str,
+    specs: List[Dict[str, Any]],
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    crumb: Optional[Dict[str, str]],
+    index: Optional[JenkinsItemIndex],
+    hash_cache: Optional[ConfigHashCache],
+    compare: bool,
+    templates: TemplateRegistry,
+    workers: int,
+) -> List[JobResult]:
+    results: List[JobResult] = []
+    failed_folders: List[str] = []
+
+    def failed_ancestor(folder: Optional[str]) -> Optional[str]:
+        return next((f for f in failed_folders if folder and (folder == f or folder.startswith(f + "/"))), None)
+
+    def apply_folder(folder: str) -> Optional[JobResult]:
+        started = time.perf_counter()
+        try:
+            ensure_folder(session, base_url, folder, headers, auth, crumb, index)
+        except Exception as exc:  # recorded like a failed job; the jobs below it are skipped
+            return JobResult(f"{folder}/", "failed", time.perf_counter() - started, str(exc))
+        return None
+
+    def apply_spec(spec: Dict[str, Any]) -> JobResult:
+        blocked = failed_ancestor(spec.get("folder"))
+        if blocked:
+            return JobResult(item_path(spec.get("folder"), spec["job_name"]), "skipped", 0.0, f"folder {blocked} failed")
+        return apply_job(session, base_url, spec, headers, auth, crumb, index, hash_cache, compare, templates)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for level in folder_levels(specs):
+            # Waiting for the whole level keeps parents strictly ahead of children.
+            level = [folder for folder in level if not failed_ancestor(folder)]
+            for result in pool.map(apply_folder, level):
+                if result is not None:
+                    results.append(result)
+                    failed_folders.append(result.job.rstrip("/"))
+        results += pool.map(apply_spec, specs)
+    return results
+
+
+def render_all(specs: List[Dict[str, Any]], templates: TemplateRegistry, out_dir: Path) -> None:
+    """Write every rendered config.xml under `out_dir`, mirroring the folder layout, for review."""
+    started = time.perf_counter()
+    for spec in specs:
+        target = out_dir.joinpath(*item_path(spec.get("folder"), spec["job_name"]).split("/"), "config.xml")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(templates.render(spec), encoding="utf-8")
+    elapsed = time.perf_counter() - started
+    rate = len(specs) / elapsed if elapsed else 0.0
+    print(f"Rendered {len(specs)} job config(s) to {out_dir} in {elapsed:.2f}s ({rate:,.0f} jobs/s)")
+
+
+def print_report(results: List[JobResult], elapsed: float) -> None:
+    width = max((len(r.job) for r in results), default=3)
+    for result in sorted(results, key=lambda r: r.seconds, reverse=True):
+        suffix = f"  {result.error}" if result.error else ""
+        print(f"{result.job:<{width}}  {result.action:<8}  {result.seconds:7.2f}s{suffix}")
+
+    counts = Counter(result.action for result in results)
+    summary = ", ".join(f"{action}={count}" for action, count in sorted(counts.items()))
+    rate = len(results) / elapsed if elapsed else 0.0
+    print(f"Applied {len(results)} job(s) in {elapsed:.1f}s ({rate:.1f} jobs/s): {summary}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Provision many Jenkins jobs in parallel")
+    parser.add_argument("--config", required=True, type=Path, help="YAML file with a list of job specs, or a directory of YAML files")
+    parser.add_argument("--url", default=os.getenv("JENKINS_URL"), help="Base Jenkins URL (defaults to JENKINS_URL env var)")
+    parser.add_argument("--user", default=os.getenv("JENKINS_USER"), help="Jenkins username (defaults to JENKINS_USER env var)")
+    parser.add_argument("--token", default=os.getenv("JENKINS_TOKEN"), help="Jenkins API token or password (defaults to JENKINS_TOKEN env var)")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel API calls (default: 8)")
+    parser.add_argument("--index-depth", type=int, default=4, help="Folder levels fetched up front to answer existence checks locally (0 disables)")
+    parser.add_argument("--state-file", type=Path, help="JSON cache of applied config digests; matching jobs are skipped without any API call")
+    parser.add_argument("--force", action="store_true", help="Always POST config.xml, even when it matches the live job")
+    parser.add_argument("--templates", type=Path, help="YAML file with named job templates and per-folder overrides")
+    parser.add_argument("--render-all", type=Path, metavar="DIR", help="Render every config.xml into DIR and exit without calling Jenkins")
+    parser.add_argument("--report", type=Path, help="Write per-job results as JSON to this file")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the specs and show the folder plan without calling Jenkins")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    specs = load_job_specs(args.config)
+    templates = TemplateRegistry.from_file(args.templates)
+
+    if args.render_all:
+        render_all(specs, templates, args.render_all)
+        return
+
+    if args.dry_run:
+        for depth, level in enumerate(folder_levels(specs), start=1):
+            print(f"[dry-run] Folder level {depth}: {', '.join(level)}")
+        print(f"[dry-run] {len(specs)} job(s) would be applied")
+        return
+
+    if not args.url or not args.user or not args.token:
+        raise ConfigError("Provide Jenkins URL, user, and token via arguments or environment variables.")
+
+    workers = max(1, args.workers)
+    session = build_session(workers)
+    auth = requests.auth.HTTPBasicAuth(args.user, args.token)
+    headers = {"User-Agent": "python-devops-launchpad"}
+
+    crumb = fetch_crumb(session, args.url, auth)
+    index = JenkinsItemIndex.fetch(session, args.url, headers, auth, args.index_depth) if args.index_depth > 0 else None
+
+    hash_cache = ConfigHashCache(args.state_file) if args.state_file else None
+
+    started = time.perf_counter()
+    results = apply_all(session, args.url, specs, headers, auth, crumb, index, hash_cache, not args.force, templates, workers)
+    print_report(results, time.perf_counter() - started)
+    if hash_cache is not None:
+        hash_cache.save()
+
+    if args.report:
+        args.report.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+    if any(r.error for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,28 +8,137 @@ configuration from Python.
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
+import threading
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import quote
 
 import requests
 
+from jenkins_templates import JENKINS_FOLDER_XML, PIPELINE_JOB_TEMPLATE, TemplateError, TemplateRegistry, xml_escape
+
 try:
     import yaml
 except ImportError:  # pragma: no cover
     yaml = None  # type: ignore
 
-JENKINS_FOLDER_XML = """<com.cloudbees.hudson.plugins.folder.Folder plugin=\"cloudbees-folder\">\n  <description>{description}</description>\n</com.cloudbees.hudson.plugins.folder.Folder>\n"""
-
-
-PIPELINE_JOB_TEMPLATE = """<flow-definition plugin=\"workflow-job\">\n  <description>{description}</description>\n  <keepDependencies>false</keepDependencies>\n  <properties/>\n  <definition class=\"org.jenkinsci.plugins.workflow.cps.CpsScmFlowDefinition\" plugin=\"workflow-cps\">\n    <scm class=\"hudson.plugins.git.GitSCM\" plugin=\"git\">\n      <configVersion>2</configVersion>\n      <userRemoteConfigs>\n        <hudson.plugins.git.UserRemoteConfig>\n          <url>{git_url}</url>\n          <credentialsId>{credentials_id}</credentialsId>\n        </hudson.plugins.git.UserRemoteConfig>\n      </userRemoteConfigs>\n      <branches>\n        <hudson.plugins.git.BranchSpec>\n          <name>{branch}</name>\n        </hudson.plugins.git.BranchSpec>\n      </branches>\n      <doGenerateSubmoduleConfigurations>false</doGenerateSubmoduleConfigurations>\n      <submoduleCfg class=\"empty-list\"/>\n      <extensions/>\n    </scm>\n    <scriptPath>{jenkinsfile}</scriptPath>\n    <lightweight>true</lightweight>\n  </definition>\n  <triggers/>\n  <disabled>false</disabled>\n</flow-definition>\n"""
+# Built-in templates only; pass a registry loaded with --templates for custom ones.
+DEFAULT_TEMPLATES = TemplateRegistry()
 
 
 class ConfigError(RuntimeError):
     pass
 
 
+class JenkinsItemIndex:
+    """Folder and job paths known to exist, fetched once with a single `tree` query.
+
+    Paths look like ``platform/services/sample-service-ci``. Only the first
+    `depth` levels are fetched; anything deeper is reported as not covered so
+    callers fall back to a direct GET (unless its parent was created this run,
+    in which case it is known to be empty).
+    """
+
+    def __init__(self, paths: Set[str], depth: int) -> None:
+        self.paths = paths
+        self.depth = depth
+        self.created: Set[str] = set()
+
+    @staticmethod
+    def tree_query(depth: int) -> str:
+        # depth=2 -> jobs[name,jobs[name]]
+        query = "name"
+        for _ in range(depth - 1):
+            query = f"name,jobs[{query}]"
+        return f"jobs[{query}]"
+
+    @classmethod
+    def fetch(
+        cls,
+        session: requests.Session,
+        base_url: str,
+        headers: Dict[str, str],
+        auth: requests.auth.AuthBase,
+        depth: int = 4,
+    ) -> "JenkinsItemIndex":
+        url = f"{base_url.rstrip('/')}/api/json"
+        response = session.get(url, headers=headers, auth=auth, params={"tree": cls.tree_query(depth)}, timeout=60)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to index Jenkins items: {response.status_code} {response.text}")
+
+        paths: Set[str] = set()
+        stack: List[tuple] = [("", response.json().get("jobs", []))]
+        while stack:
+            prefix, jobs = stack.pop()
+            for job in jobs or []:
+                path = f"{prefix}{job['name']}"
+                paths.add(path)
+                stack.append((f"{path}/", job.get("jobs")))
+        return cls(paths, depth)
+
+    def covers(self, path: str) -> bool:
+        parts = [p for p in path.split("/") if p]
+        return len(parts) <= self.depth or "/".join(parts[:-1]) in self.created
+
+    def __contains__(self, path: str) -> bool:
+        return path.strip("/") in self.paths
+
+    def add(self, path: str) -> None:
+        self.paths.add(path.strip("/"))
+        self.created.add(path.strip("/"))
+
+
+def item_path(folder: Optional[str], name: str) -> str:
+    return "/".join(p for p in [*(folder or "").split("/"), name] if p)
+
+
+def config_digest(job_xml: str) -> str:
+    """Hash a job config so cosmetic differences Jenkins introduces do not count as changes.
+
+    Jenkins re-serializes stored configs: it adds an XML declaration, pins
+    plugin versions (``plugin="git@5.2.1"``), re-indents, and adds an empty
+    ``<actions/>`` element. All of those are normalized away before hashing.
+    """
+    root = ET.fromstring(job_xml.strip().encode("utf-8"))
+    for element in root.iter():
+        plugin = element.get("plugin")
+        if plugin:
+            element.set("plugin", plugin.split("@", 1)[0])
+    for child in list(root):
+        if child.tag == "actions" and len(child) == 0 and not (child.text or "").strip():
+            root.remove(child)
+    canonical = ET.canonicalize(ET.tostring(root, encoding="unicode"), strip_text=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ConfigHashCache:
+    """Digests of the configs applied in earlier runs, stored as JSON next to your job specs.
+
+    A matching digest means the job is skipped without any network call, so
+    delete the file (or run without it) after editing jobs in the Jenkins UI.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.digests: Dict[str, str] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self.lock = threading.Lock()
+
+    def get(self, job_path: str) -> Optional[str]:
+        return self.digests.get(job_path)
+
+    def set(self, job_path: str, digest: str) -> None:
+        with self.lock:
+            self.digests[job_path] = digest
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.write_text(json.dumps(self.digests, indent=2, sort_keys=True), encoding="utf-8")
+
+
 def load_config(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise ConfigError(f"Config file not found: {path}")
@@ -45,15 +154,17 @@ def load_config(path: Path) -> Dict[str, Any]:
     if not isinstance(data, dict):
         raise ConfigError("Configuration root must be a mapping/dictionary.")
 
-    required = {"job_name", "git_url"}
+    return validate_job_config(data)
+
+
+def validate_job_config(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Defaults such as branch or jenkinsfile come from the job's template (see jenkins_templates.py).
+    required = {"job_name"}
+    if not data.get("template"):
+        required.add("git_url")
     missing = required - data.keys()
     if missing:
         raise ConfigError(f"Missing required config keys: {', '.join(sorted(missing))}")
-
-    data.setdefault("description", "Provisioned via Python DevOps Launchpad")
-    data.setdefault("branch", "*/main")
-    data.setdefault("jenkinsfile", "Jenkinsfile")
-    data.setdefault("credentials_id", "")
     return data
 
 
@@ -79,6 +190,7 @@ def ensure_folder(
     headers: Dict[str, str],
     auth: requests.auth.AuthBase,
     crumb: Optional[Dict[str, str]],
+    index: Optional[JenkinsItemIndex] = None,
 ) -> None:
     if not folder:
         return
@@ -86,23 +198,29 @@ def ensure_folder(
     parts = [p for p in folder.split("/") if p]
     for depth in range(1, len(parts) + 1):
         current = "/".join(parts[:depth])
-        folder_url = build_job_path(base_url, "/".join(parts[:depth - 1]) if depth > 1 else None, parts[depth - 1])
-        api_url = f"{folder_url}/api/json"
-        response = session.get(api_url, headers=headers, auth=auth, timeout=15)
-        if response.status_code == 200:
-            continue
-        if response.status_code != 404:
-            raise RuntimeError(f"Failed to inspect folder {current}: {response.status_code} {response.text}")
+        if index is not None and index.covers(current):
+            if current in index:
+                continue
+        else:
+            folder_url = build_job_path(base_url, "/".join(parts[:depth - 1]) if depth > 1 else None, parts[depth - 1])
+            api_url = f"{folder_url}/api/json"
+            response = session.get(api_url, headers=headers, auth=auth, timeout=15)
+            if response.status_code == 200:
+                continue
+            if response.status_code != 404:
+                raise RuntimeError(f"Failed to inspect folder {current}: {response.status_code} {response.text}")
         parent = build_job_path(base_url, "/".join(parts[:depth - 1]) if depth > 1 else None, "")
         parent = parent.rstrip("/")
         create_url = f"{parent}/createItem?name={quote(parts[depth - 1])}"
-        payload = JENKINS_FOLDER_XML.format(description=f"Auto-created folder {current}")
+        payload = JENKINS_FOLDER_XML.format(description=xml_escape(f"Auto-created folder {current}"))
         folder_headers = {**headers, "Content-Type": "application/xml"}
         if crumb:
             folder_headers.update(crumb)
         resp = session.post(create_url, headers=folder_headers, auth=auth, data=payload.encode("utf-8"), timeout=15)
         if resp.status_code not in {200, 201}:
             raise RuntimeError(f"Failed to create folder {current}: {resp.status_code} {resp.text}")
+        if index is not None:
+            index.add(current)
 
 
 def fetch_crumb(session: requests.Session, base_url: str, auth: requests.auth.AuthBase) -> Optional[Dict[str, str]]:
@@ -116,7 +234,19 @@ def fetch_crumb(session: requests.Session, base_url: str, auth: requests.auth.Au
     raise RuntimeError(f"Failed to fetch Jenkins crumb: {response.status_code} {response.text}")
 
 
-def job_exists(session: requests.Session, base_url: str, folder: Optional[str], job_name: str, headers: Dict[str, str], auth: requests.auth.AuthBase) -> bool:
+def job_exists(
+    session: requests.Session,
+    base_url: str,
+    folder: Optional[str],
+    job_name: str,
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+    index: Optional[JenkinsItemIndex] = None,
+) -> bool:
+    path = item_path(folder, job_name)
+    if index is not None and index.covers(path):
+        return path in index
+
     url = f"{build_job_path(base_url, folder, job_name)}/api/json"
     response = session.get(url, headers=headers, auth=auth, timeout=15)
     if response.status_code == 200:
@@ -126,6 +256,23 @@ def job_exists(session: requests.Session, base_url: str, folder: Optional[str],
     raise RuntimeError(f"Failed to inspect job {job_name}: {response.status_code} {response.text}")
 
 
+def fetch_job_config(
+    session: requests.Session,
+    base_url: str,
+    folder: Optional[str],
+    job_name: str,
+    headers: Dict[str, str],
+    auth: requests.auth.AuthBase,
+) -> Optional[str]:
+    url = f"{build_job_path(base_url, folder, job_name)}/config.xml"
+    response = session.get(url, headers=headers, auth=auth, timeout=15)
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to read config for job {job_name}: {response.status_code} {response.text}")
+    return response.text
+
+
 def create_or_update_job(
     session: requests.Session,
     base_url: str,
@@ -134,28 +281,42 @@ def create_or_update_job(
     auth: requests.auth.AuthBase,
     crumb: Optional[Dict[str, str]],
     dry_run: bool,
-) -> None:
+    index: Optional[JenkinsItemIndex] = None,
+    hash_cache: Optional[ConfigHashCache] = None,
+    compare: bool = True,
+    templates: Optional[TemplateRegistry] = None,
+) -> str:
     job_name = config["job_name"]
     folder = config.get("folder")
-    ensure_folder(session, base_url, folder or "", headers, auth, crumb)
+    path = item_path(folder, job_name)
 
-    job_xml = PIPELINE_JOB_TEMPLATE.format(
-        description=config.get("description", "Managed via API"),
-        git_url=config["git_url"],
-        branch=config.get("branch", "*/main"),
-        credentials_id=config.get("credentials_id", ""),
-        jenkinsfile=config.get("jenkinsfile", "Jenkinsfile"),
-    )
+    try:
+        job_xml = (templates or DEFAULT_TEMPLATES).render(config)
+    except TemplateError as exc:
+        raise ConfigError(str(exc)) from exc
 
     if dry_run:
         print(job_xml)
-        return
+        return "dry-run"
 
+    ensure_folder(session, base_url, folder or "", headers, auth, crumb, index)
     item_headers = {**headers, "Content-Type": "application/xml"}
     if crumb:
         item_headers.update(crumb)
 
-    if job_exists(session, base_url, folder, job_name, headers, auth):
+    digest = config_digest(job_xml)
+    if job_exists(session, base_url, folder, job_name, headers, auth, index):
+        # Posting an identical config still makes Jenkins rewrite it and record history.
+        unchanged = compare and hash_cache is not None and hash_cache.get(path) == digest
+        if not unchanged and compare:
+            current = fetch_job_config(session, base_url, folder, job_name, headers, auth)
+            unchanged = current is not None and config_digest(current) == digest
+        if unchanged:
+            if hash_cache is not None:
+                hash_cache.set(path, digest)
+            print(f"Job unchanged: {job_name}")
+            return "unchanged"
+
         url = f"{build_job_path(base_url, folder, job_name)}/config.xml"
         response = session.post(url, headers=item_headers, auth=auth, data=job_xml.encode("utf-8"), timeout=20)
         action = "updated"
@@ -170,8 +331,13 @@ def create_or_update_job(
 
     if response.status_code not in {200, 201}:
         raise RuntimeError(f"Failed to {action} job {job_name}: {response.status_code} {response.text}")
+    if index is not None:
+        index.add(path)
+    if hash_cache is not None:
+        hash_cache.set(path, digest)
 
     print(f"Job {action}: {job_name}")
+    return action
 
 
 def parse_args() -> argparse.Namespace:
@@ -181,6 +347,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--user", default=os.getenv("JENKINS_USER"), help="Jenkins username (defaults to JENKINS_USER env var)")
     parser.add_argument("--token", default=os.getenv("JENKINS_TOKEN"), help="Jenkins API token or password (defaults to JENKINS_TOKEN env var)")
     parser.add_argument("--dry-run", action="store_true", help="Print XML instead of calling Jenkins")
+    parser.add_argument("--index-depth", type=int, default=4, help="Folder levels fetched up front to answer existence checks locally (0 disables)")
+    parser.add_argument("--state-file", type=Path, help="JSON cache of applied config digests; matching jobs are skipped without any API call")
+    parser.add_argument("--force", action="store_true", help="Always POST config.xml, even when it matches the live job")
+    parser.add_argument("--templates", type=Path, help="YAML file with named job templates and per-folder overrides")
     return parser.parse_args()
 
 
@@ -190,6 +360,7 @@ def main() -> None:
         raise ConfigError("Provide Jenkins URL, user, and token via arguments or environment variables.")
 
     config = load_config(args.config)
+    templates = TemplateRegistry.from_file(args.templates)
 
     session = requests.Session()
     auth = requests.auth.HTTPBasicAuth(args.user, args.token)
@@ -199,7 +370,11 @@ def main() -> None:
     if crumb:
         print("Crumb fetched successfully")
 
-    create_or_update_job(session, args.url, config, headers, auth, crumb, args.dry_run)
+    index = JenkinsItemIndex.fetch(session, args.url, headers, auth, args.index_depth) if args.index_depth > 0 else None
+    hash_cache = ConfigHashCache(args.state_file) if args.state_file else None
+    create_or_update_job(session, args.url, config, headers, auth, crumb, args.dry_run, index, hash_cache, not args.force, templates)
+    if hash_cache is not None:
+        hash_cache.save()
 
 
 if __name__ == "__main__":
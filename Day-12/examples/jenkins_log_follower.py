@@ -0,0 +1,223 @@
+"""Stream Jenkins console logs incrementally for one or many builds.
+
+Instead of downloading a whole console log, this script calls
+`logText/progressiveText?start=<offset>` and only receives bytes it has not
+seen yet. Jenkins reports the next offset in `X-Text-Size` and whether the
+build is still writing in `X-More-Data`. Each build is followed by its own
+worker and streamed in fixed-size chunks, so memory stays flat no matter how
+large the logs grow.
+
+Usage example:
+    python jenkins_log_follower.py platform/services/sample-service-ci:42 platform/infra/terraform-plan
+    python jenkins_log_follower.py app-ci:981 --grep 'ERROR|FAILED' --output-dir logs/
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Pattern
+
+import requests
+
+from jenkins_builds import TrackedBuild, parse_watch_target
+from jenkins_bulk_provisioner import build_session
+from jenkins_job_provisioner import ConfigError
+
+CHUNK_SIZE = 64 * 1024
+# A single "line" longer than this is emitted in pieces rather than buffered forever.
+MAX_LINE_BYTES = 1024 * 1024
+
+stdout_lock = threading.Lock()
+
+
+class LineSink:
+    """Turn a byte stream into filtered, optionally prefixed lines without holding more than one line."""
+
+    def __init__(self, out: BinaryIO, pattern: Optional[Pattern[bytes]], prefix: bytes, lock: Optional[threading.Lock]) -> None:
+        self.out = out
+        self.pattern = pattern
+        self.prefix = prefix
+        self.lock = lock
+        self.partial = b""
+        self.matched = 0
+
+    def feed(self, chunk: bytes) -> None:
+        data = self.partial + chunk
+        lines = data.split(b"\n")
+        self.partial = lines.pop()
+        if len(self.partial) > MAX_LINE_BYTES:
+            lines.append(self.partial)
+            self.partial = b""
+        self.emit(lines)
+
+    def close(self) -> None:
+        if self.partial:
+            self.emit([self.partial])
+            self.partial = b""
+
+    def emit(self, lines: List[bytes]) -> None:
+        selected = [line for line in lines if self.pattern is None or self.pattern.search(line)]
+        if not selected:
+            return
+        self.matched += len(selected)
+        payload = b"".join(self.prefix + line + b"\n" for line in selected)
+        if self.lock:
+            with self.lock:
+                self.out.write(payload)
+                self.out.flush()
+        else:
+            self.out.write(payload)
+
+
+def read_offset(path: Path) -> Optional[int]:
+    try:
+        return int(path.read_text(encoding="utf-8").strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_offset(path: Path, offset: int) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(str(offset), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def follow_build(
+    session: requests.Session,
+    build: TrackedBuild,
+    auth: requests.auth.AuthBase,
+    headers: Dict[str, str],
+    output_dir: Optional[Path],
+    pattern: Optional[Pattern[bytes]],
+    prefix_lines: bool,
+    interval: float,
+    max_interval: float,
+    follow: bool,
+) -> str:
+    if build.number is None:
+        # Resolve `lastBuild` once so a newer build cannot swap logs underneath the offsets.
+        response = session.get(f"{build.build_url.rstrip('/')}/api/json", params={"tree": "number,url"}, headers=headers, auth=auth, timeout=15)
+        if response.status_code != 200:
+            return f"{build.job}: no build found ({response.status_code})"
+        data = response.json()
+        build.number, build.build_url = data["number"], data["url"]
+
+    label = f"{build.job}#{build.number}"
+    start = 0
+    target: Optional[BinaryIO] = None
+    offset_path: Optional[Path] = None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / (re.sub(r"[^A-Za-z0-9._-]+", "_", label) + ".log")
+        if pattern is None:
+            if path.exists():
+                # Raw logs on disk are byte-for-byte copies, so their size is the resume offset.
+                start = path.stat().st_size
+            target = path.open("ab")
+        else:
+            # Filtered output says nothing about how far the console log was read, so keep that in a sidecar.
+            offset_path = path.with_name(path.name + ".offset")
+            saved = read_offset(offset_path) if path.exists() else None
+            start = saved or 0
+            target = path.open("ab" if saved is not None else "wb")
+        sink = LineSink(target, pattern, b"", None) if pattern else None
+    else:
+        sink = LineSink(sys.stdout.buffer, pattern, f"[{label}] ".encode() if prefix_lines else b"", stdout_lock)
+
+    url = f"{build.build_url.rstrip('/')}/logText/progressiveText"
+    delay = interval
+    finished = False
+    # Bytes of the console log already handed to the sink or file; only this is safe to resume from.
+    consumed = start
+    try:
+        while True:
+            with session.get(url, params={"start": start}, headers=headers, auth=auth, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    return f"{label}: failed ({response.status_code})"
+                received = 0
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if sink is not None:
+                        sink.feed(chunk)
+                    else:
+                        target.write(chunk)
+                    received += len(chunk)
+                    consumed += len(chunk)
+                start = int(response.headers.get("X-Text-Size", start + received))
+                more = response.headers.get("X-More-Data", "").lower() == "true"
+            consumed = start
+            finished = not more
+            if offset_path is not None:
+                target.flush()
+                save_offset(offset_path, consumed - len(sink.partial))
+
+            if not more or not follow:
+                break
+            # Back off while the build is quiet, snap back as soon as output arrives.
+            delay = interval if received else min(delay * 2, max_interval)
+            time.sleep(delay)
+    finally:
+        if offset_path is not None and not finished:
+            # Leave an unfinished last line to the next run, which starts right before it.
+            target.flush()
+            save_offset(offset_path, consumed - len(sink.partial))
+        elif sink is not None:
+            sink.close()
+            if offset_path is not None:
+                target.flush()
+                save_offset(offset_path, consumed)
+        if target is not None:
+            target.close()
+
+    matched = f", {sink.matched} matching line(s)" if pattern is not None and sink is not None else ""
+    return f"{label}: complete at {start} bytes{matched}"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Follow Jenkins console logs incrementally")
+    parser.add_argument("targets", nargs="+", help="job or job:build_number (default: last build)")
+    parser.add_argument("--url", default=os.getenv("JENKINS_URL"), help="Base Jenkins URL (defaults to JENKINS_URL env var)")
+    parser.add_argument("--user", default=os.getenv("JENKINS_USER"), help="Jenkins username (defaults to JENKINS_USER env var)")
+    parser.add_argument("--token", default=os.getenv("JENKINS_TOKEN"), help="Jenkins API token or password (defaults to JENKINS_TOKEN env var)")
+    parser.add_argument("--grep", help="Only emit lines matching this regular expression")
+    parser.add_argument("--output-dir", type=Path, help="Write one .log file per build here instead of stdout (reruns resume where they stopped)")
+    parser.add_argument("--no-follow", action="store_true", help="Fetch what exists now and stop, even if the build is running")
+    parser.add_argument("--interval", type=float, default=2.0, help="Delay between polls while output is flowing, in seconds")
+    parser.add_argument("--max-interval", type=float, default=15.0, help="Longest delay between polls of a quiet build, in seconds")
+    parser.add_argument("--workers", type=int, default=32, help="Builds followed at the same time (default: 32)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.user or not args.token:
+        raise ConfigError("Provide Jenkins URL, user, and token via arguments or environment variables.")
+
+    pattern = re.compile(args.grep.encode("utf-8")) if args.grep else None
+    builds = [parse_watch_target(args.url, target) for target in args.targets]
+    workers = max(1, min(args.workers, len(builds)))
+    session = build_session(workers)
+    auth = requests.auth.HTTPBasicAuth(args.user, args.token)
+    headers = {"User-Agent": "python-devops-launchpad"}
+
+    def run(build: TrackedBuild) -> str:
+        try:
+            return follow_build(
+                session, build, auth, headers, args.output_dir, pattern, len(builds) > 1, args.interval, args.max_interval, not args.no_follow
+            )
+        except requests.RequestException as exc:
+            return f"{build.job}: error ({exc})"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for summary in pool.map(run, builds):
+            print(summary, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,106 @@
-def update_server_config(file_path, key, value):
-    # Read the existing content of the server configuration file
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-
-    # Update the configuration value for the specified key
-    with open(file_path, 'w') as file:
-        for line in lines:
-            # Check if the line starts with the specified key
-            if key in line:
-                # Update the line with the new value
-                file.write(key + "=" + value + "\n")
-            else:
-                # Keep the existing line as it is
-                file.write(line)
-
-# Path to the server configuration file
-server_config_file = 'server.conf'
-
-# Key and new value for updating the server configuration
-key_to_update = 'MAX_CONNECTIONS'
-new_value = '600'  # New maximum connections allowed
-
-# Update the server configuration file
-update_server_config(server_config_file, key_to_update, new_value)
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+# Matches "KEY = value" lines and keeps the pieces around the value so spacing survives.
+# Group 1: indentation + key + "=" with its spaces, group 2: the key, group 3: the value,
+# group 4: trailing spaces and the line ending.
+CONFIG_LINE = re.compile(r"^(\s*([A-Za-z_][A-Za-z0-9_.-]*)\s*=[ \t]*)(.*?)([ \t]*\r?\n?)$")
+
+
+def parse_config_line(line):
+    """
+    Returns (key, value) for a "KEY = value" line, or None for comments and blank lines.
+    """
+    if line.lstrip().startswith("#"):
+        return None
+    match = CONFIG_LINE.match(line)
+    if not match:
+        return None
+    return match.group(2), match.group(3)
+
+
+def update_server_config(file_path, key, value=None):
+    """
+    Updates one key (update_server_config(path, "PORT", "9090")) or many keys at once
+    (update_server_config(path, {"PORT": "9090", "TIMEOUT": "60"})) and saves the file.
+
+    Returns a dict of {key: (old_value, new_value)} for every key that changed.
+    Keys that are not in the file yet are added at the end (old_value is None).
+    """
+    updates = dict(key) if isinstance(key, dict) else {key: value}
+    changes = {}
+    found = set()
+    directory = os.path.dirname(os.path.abspath(file_path))
+
+    # Step 1: Read the file line by line and write the new version to a temporary file
+    # next to it. Only one line is in memory at a time, so file size does not matter.
+    # newline="" keeps the original line endings exactly as they are.
+    with open(file_path, "r", newline="") as source, tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".update_server-", delete=False, newline=""
+    ) as target:
+        try:
+            last_line = ""
+            line_ending = "\n"
+            for line in source:
+                last_line = line
+                if line.endswith("\r\n"):
+                    line_ending = "\r\n"
+                parsed = parse_config_line(line)
+                # Compare the whole key, so updating PORT never touches SSL_PORT.
+                if parsed and parsed[0] in updates:
+                    line_key, old_value = parsed
+                    found.add(line_key)
+                    new_value = str(updates[line_key])
+                    if old_value != new_value:
+                        match = CONFIG_LINE.match(line)
+                        line = match.group(1) + new_value + match.group(4)
+                        changes[line_key] = (old_value, new_value)
+                target.write(line)
+
+            # Step 2: Add keys that were not in the file.
+            missing = [k for k in updates if k not in found]
+            if missing and last_line and not last_line.endswith("\n"):
+                target.write(line_ending)
+            for missing_key in missing:
+                target.write(f"{missing_key}={updates[missing_key]}{line_ending}")
+                changes[missing_key] = (None, str(updates[missing_key]))
+
+            # Make sure the data is on disk before the new file takes the old one's place.
+            target.flush()
+            os.fsync(target.fileno())
+        except BaseException:
+            os.unlink(target.name)
+            raise
+
+    # Step 3: Swap the new file in. os.replace is atomic, so anyone reading the config
+    # sees either the old file or the new one, never a half-written file.
+    if not changes:
+        os.unlink(target.name)  # nothing changed: leave the original untouched
+        return changes
+    shutil.copymode(file_path, target.name)
+    os.replace(target.name, file_path)
+    return changes
+
+
+if __name__ == "__main__":
+    # Path to the server configuration file
+    server_config_file = 'server.conf'
+
+    # Keys and new values for updating the server configuration
+    updates = {'MAX_CONNECTIONS': '600'}  # New maximum connections allowed
+
+    # Optional: python3 update_server.py server.conf PORT=9090 TIMEOUT=60
+    if len(sys.argv) > 1:
+        server_config_file = sys.argv[1]
+    if len(sys.argv) > 2:
+        updates = dict(arg.split("=", 1) for arg in sys.argv[2:])
+
+    # Update the server configuration file
+    changes = update_server_config(server_config_file, updates)
+    for changed_key, (old_value, new_value) in changes.items():
+        print(f"Updated {changed_key}: {old_value} -> {new_value} in {server_config_file}")
+    if not changes:
+        print(f"{server_config_file} already up to date")
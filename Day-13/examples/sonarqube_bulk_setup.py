@@ -0,0 +1,266 @@
+"""Provision many SonarQube projects in one run.
+
+`sonarqube_project_setup.py` handles one config and checks existence with one
+`/api/projects/search` call per project. This script loads a list of project
+configs (a YAML/JSON list, a `projects:` list with shared `defaults:`, or a
+directory of such files), resolves which keys already exist with a few batched
+`projects=` searches, then runs the create, quality-profile and token steps on
+a bounded worker pool that shares one pooled `requests.Session`. The report at
+the end shows how long each stage took.
+
+Reruns are safe: projects that already exist and already have a token in
+`--tokens-file` skip the token step, new tokens are merged into that file, and
+a token name SonarQube says already exists is not treated as a failure.
+
+Usage example:
+    python sonarqube_bulk_setup.py --config projects.yaml --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from sonarqube_project_setup import (
+    ConfigError,
+    assign_quality_profile,
+    create_project,
+    generate_token,
+    sonar_request,
+    validate_project_config,
+    yaml,
+)
+
+# Keep search URLs comfortably below the common 8 KB proxy/server limit.
+MAX_KEYS_PARAM_CHARS = 4000
+SEARCH_PAGE_SIZE = 500  # largest page /api/projects/search allows
+
+STAGES = ("lookup", "create", "quality_profile", "token")
+
+
+@dataclass
+class ProjectResult:
+    key: str
+    status: str = "ok"
+    timings: Dict[str, float] = field(default_factory=dict)
+    token: Optional[str] = None
+    error: Optional[str] = None
+
+
+def load_project_configs(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        raise ConfigError(f"Config path not found: {path}")
+
+    files = sorted(p for p in path.iterdir() if p.suffix.lower() in {".yaml", ".yml", ".json"}) if path.is_dir() else [path]
+    configs: List[Dict[str, Any]] = []
+    for file in files:
+        text = file.read_text(encoding="utf-8")
+        if file.suffix.lower() in {".yaml", ".yml"}:
+            if yaml is None:
+                raise ConfigError("Install PyYAML to read YAML configs (pip install pyyaml).")
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+
+        defaults: Dict[str, Any] = {}
+        if isinstance(data, dict) and "projects" in data:
+            defaults = data.get("defaults") or {}
+            data = data["projects"]
+        for entry in data if isinstance(data, list) else [data]:
+            if not isinstance(entry, dict):
+                raise ConfigError(f"{file}: every project config must be a dictionary.")
+            configs.append(validate_project_config({**defaults, **entry}))
+
+    keys = [c["project_key"] for c in configs]
+    if len(keys) != len(set(keys)):
+        raise ConfigError("Duplicate project_key entries in config.")
+    return configs
+
+
+def chunk_keys(keys: Iterable[str], max_chars: int = MAX_KEYS_PARAM_CHARS, max_keys: Optional[int] = None) -> Iterator[List[str]]:
+    """Group keys so each comma-joined `projects=` value stays under `max_chars` (and `max_keys`)."""
+    chunk: List[str] = []
+    length = 0
+    for key in keys:
+        # Commas and most key characters are percent-encoded, so budget 3x per char.
+        cost = 3 * (len(key) + 1)
+        if chunk and (length + cost > max_chars or len(chunk) == max_keys):
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(key)
+        length += cost
+    if chunk:
+        yield chunk
+
+
+def fetch_existing_keys(session: requests.Session, base_url: str, auth: requests.auth.AuthBase, keys: List[str]) -> Set[str]:
+    existing: Set[str] = set()
+    for chunk in chunk_keys(keys):
+        page = 1
+        while True:
+            response = sonar_request(
+                session,
+                "GET",
+                base_url,
+                "/api/projects/search",
+                auth,
+                params={"projects": ",".join(chunk), "ps": SEARCH_PAGE_SIZE, "p": page},
+            )
+            data = response.json()
+            existing.update(component["key"] for component in data.get("components", []))
+            paging = data.get("paging", {})
+            if page * paging.get("pageSize", SEARCH_PAGE_SIZE) >= paging.get("total", 0):
+                break
+            page += 1
+    return existing
+
+
+def build_session(workers: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def load_tokens(path: Optional[Path]) -> Dict[str, str]:
+    """Tokens saved by an earlier run, keyed by project key."""
+    if path is None or not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise ConfigError(f"{path} is not a JSON tokens file: {exc}")
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path} must hold a JSON object of project key -> token.")
+    return data
+
+
+def generate_token_once(
+    session: requests.Session, base_url: str, auth: requests.auth.AuthBase, config: Dict[str, Any], dry_run: bool
+) -> Optional[str]:
+    try:
+        return generate_token(session, base_url, auth, config, dry_run)
+    except RuntimeError as exc:
+        if "already exists" in str(exc):
+            return None  # made by an earlier run; SonarQube never shows a token twice
+        raise
+
+
+def provision_one(
+    session: requests.Session,
+    base_url: str,
+    auth: requests.auth.AuthBase,
+    config: Dict[str, Any],
+    exists: bool,
+    has_token: bool,
+    dry_run: bool,
+) -> ProjectResult:
+    status = "exists" if exists else "would_create" if dry_run else "created"
+    result = ProjectResult(config["project_key"], status=status)
+    steps = [] if exists else [("create", lambda: create_project(session, base_url, auth, config, dry_run))]
+    steps.append(("quality_profile", lambda: assign_quality_profile(session, base_url, auth, config, dry_run)))
+    if not (exists and has_token):
+        steps.append(("token", lambda: generate_token_once(session, base_url, auth, config, dry_run)))
+    for stage, step in steps:
+        started = time.perf_counter()
+        try:
+            value = step()
+        except Exception as exc:  # keep going; failures are collected in the report
+            result.status, result.error = "failed", f"{stage}: {exc}"
+            return result
+        finally:
+            result.timings[stage] = time.perf_counter() - started
+        if stage == "token" and value:
+            result.token = value
+    return result
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_report(results: List[ProjectResult], lookup_seconds: float, elapsed: float) -> None:
+    for result in results:
+        if result.error:
+            print(f"FAILED {result.key}: {result.error}")
+
+    print(f"{'stage':<16} {'calls':>6} {'avg ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    print(f"{'lookup (batched)':<16} {'-':>6} {lookup_seconds * 1000:>8.0f} {'-':>8} {'-':>8}")
+    for stage in STAGES[1:]:
+        samples = [r.timings[stage] for r in results if stage in r.timings]
+        if samples:
+            avg = sum(samples) / len(samples)
+            print(f"{stage:<16} {len(samples):>6} {avg * 1000:>8.0f} {percentile(samples, 0.95) * 1000:>8.0f} {max(samples) * 1000:>8.0f}")
+
+    counts = Counter(result.status for result in results)
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+    print(f"Processed {len(results)} project(s) in {elapsed:.1f}s: {summary}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Provision many SonarQube projects from config")
+    parser.add_argument("--config", required=True, type=Path, help="YAML/JSON file with a list of projects, or a directory of them")
+    parser.add_argument("--url", default=os.getenv("SONAR_URL"), help="SonarQube base URL (or set SONAR_URL)")
+    parser.add_argument("--token", default=os.getenv("SONAR_TOKEN"), help="SonarQube admin token (or set SONAR_TOKEN)")
+    parser.add_argument("--workers", type=int, default=8, help="Projects processed in parallel (default: 8)")
+    parser.add_argument("--tokens-file", type=Path, help="Write generated analysis tokens here as JSON instead of printing them")
+    parser.add_argument("--dry-run", action="store_true", help="Log actions without mutating state")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.token:
+        raise ConfigError("Provide SonarQube URL and token via arguments or environment variables.")
+
+    configs = load_project_configs(args.config)
+    saved_tokens = load_tokens(args.tokens_file)
+    workers = max(1, args.workers)
+    session = build_session(workers)
+    auth = requests.auth.HTTPBasicAuth(args.token, "")
+
+    started = time.perf_counter()
+    existing = fetch_existing_keys(session, args.url, auth, [c["project_key"] for c in configs])
+    lookup_seconds = time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(
+            pool.map(
+                lambda c: provision_one(
+                    session, args.url, auth, c, c["project_key"] in existing, c["project_key"] in saved_tokens, args.dry_run
+                ),
+                configs,
+            )
+        )
+    print_report(results, lookup_seconds, time.perf_counter() - started)
+
+    tokens = {r.key: r.token for r in results if r.token}
+    if tokens and args.tokens_file:
+        # Owner-only from the first byte; fchmod also tightens a file that already existed.
+        fd = os.open(args.tokens_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps({**saved_tokens, **tokens}, indent=2))
+        print(f"Wrote {len(tokens)} new token(s) to {args.tokens_file} (they won't be shown again)")
+    elif tokens:
+        for key, token in tokens.items():
+            print(f"Token for {key} (store it securely, it won't be shown again): {token}")
+
+    if any(r.error for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Check quality gates and key metrics for many SonarQube projects before a release.
+
+Metrics are pulled in batches through `/api/measures/search` (up to 100
+`projectKeys` per call) and quality-gate statuses are fetched concurrently
+from `/api/qualitygates/project_status`. Measures can be cached on disk for a
+short TTL (`--cache-ttl`) so re-running the table costs almost nothing; gate
+statuses are never cached, so a gate cannot pass on a stale answer.
+The script prints a compact table and exits non-zero when any gate is not OK.
+
+Usage example:
+    python sonarqube_gate_check.py --projects sample-service,billing-api
+    python sonarqube_gate_check.py --config ../sonarqube_projects_bulk.sample.yaml --metrics coverage,bugs
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from sonarqube_bulk_setup import build_session, chunk_keys, load_project_configs
+from sonarqube_project_setup import ConfigError, sonar_request
+
+DEFAULT_METRICS = "coverage,bugs,vulnerabilities,code_smells"
+MEASURES_BATCH_SIZE = 100  # SonarQube rejects more projectKeys per measures/search call
+DEFAULT_CACHE = Path(".sonar_gate_cache.json")
+
+
+class ResponseCache:
+    """JSON responses keyed by request, reused until they are `ttl` seconds old."""
+
+    def __init__(self, path: Optional[Path], ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Tuple[float, Any]] = {}
+        if path and path.exists() and ttl > 0:
+            try:
+                self.entries = {key: tuple(value) for key, value in json.loads(path.read_text(encoding="utf-8")).items()}
+            except (ValueError, TypeError):
+                self.entries = {}  # corrupt cache: start over
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.entries[key] = (time.time(), value)
+
+    def save(self) -> None:
+        if not self.path or self.ttl <= 0:
+            return
+        now = time.time()
+        with self.lock:
+            fresh = {key: entry for key, entry in self.entries.items() if now - entry[0] < self.ttl}
+        self.path.write_text(json.dumps(fresh), encoding="utf-8")
+
+
+def cached_get(
+    session: requests.Session,
+    base_url: str,
+    path: str,
+    auth: requests.auth.AuthBase,
+    params: Dict[str, Any],
+    cache: ResponseCache,
+) -> Any:
+    key = f"{base_url.rstrip('/')}{path}?{json.dumps(params, sort_keys=True)}"
+    data = cache.get(key)
+    if data is None:
+        data = sonar_request(session, "GET", base_url, path, auth, params=params).json()
+        cache.set(key, data)
+    return data
+
+
+def fetch_measures(
+    session: requests.Session,
+    base_url: str,
+    auth: requests.auth.AuthBase,
+    keys: List[str],
+    metrics: List[str],
+    cache: ResponseCache,
+    pool: ThreadPoolExecutor,
+) -> Dict[str, Dict[str, str]]:
+    def fetch_batch(batch: List[str]) -> Any:
+        params = {"projectKeys": ",".join(batch), "metricKeys": ",".join(metrics)}
+        try:
+            return cached_get(session, base_url, "/api/measures/search", auth, params, cache)
+        except RuntimeError as exc:
+            # Same as the gate status: report it and leave these projects' measures empty.
+            print(f"{', '.join(batch)}: {exc}")
+            return {}
+
+    measures: Dict[str, Dict[str, str]] = {key: {} for key in keys}
+    for data in pool.map(fetch_batch, chunk_keys(keys, max_keys=MEASURES_BATCH_SIZE)):
+        for measure in data.get("measures", []):
+            value = measure.get("value", measure.get("period", {}).get("value", ""))
+            measures.setdefault(measure["component"], {})[measure["metric"]] = value
+    return measures
+
+
+def fetch_gate_status(
+    session: requests.Session,
+    base_url: str,
+    auth: requests.auth.AuthBase,
+    key: str,
+) -> str:
+    try:
+        data = sonar_request(session, "GET", base_url, "/api/qualitygates/project_status", auth, params={"projectKey": key}).json()
+    except RuntimeError as exc:
+        # Unknown projects or missing permissions should fail the gate, not crash the run.
+        print(f"{key}: {exc}")
+        return "ERROR"
+    return data.get("projectStatus", {}).get("status", "NONE")
+
+
+def print_table(keys: List[str], gates: Dict[str, str], measures: Dict[str, Dict[str, str]], metrics: List[str]) -> None:
+    shown = [m for m in metrics if m != "alert_status"]  # already shown as the gate column
+    width = max([len("project"), *(len(k) for k in keys)])
+    print(f"{'project':<{width}}  {'gate':<6}  " + "  ".join(f"{m:>15}" for m in shown))
+    # Failing projects first so they are visible without scrolling.
+    for key in sorted(keys, key=lambda k: (gates[k] == "OK", k)):
+        values = "  ".join(f"{measures.get(key, {}).get(m, '-'):>15}" for m in shown)
+        print(f"{key:<{width}}  {gates[key]:<6}  {values}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fail CI when SonarQube quality gates are not green")
+    parser.add_argument("--projects", help="Comma-separated project keys")
+    parser.add_argument("--projects-file", type=Path, help="File with one project key per line")
+    parser.add_argument("--config", type=Path, help="Project config file/directory as used by sonarqube_bulk_setup.py")
+    parser.add_argument("--metrics", default=DEFAULT_METRICS, help=f"Comma-separated metric keys (default: {DEFAULT_METRICS})")
+    parser.add_argument("--url", default=os.getenv("SONAR_URL"), help="SonarQube base URL (or set SONAR_URL)")
+    parser.add_argument("--token", default=os.getenv("SONAR_TOKEN"), help="SonarQube token with Browse permission (or set SONAR_TOKEN)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent API calls (default: 16)")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE, help=f"Response cache file (default: {DEFAULT_CACHE})")
+    parser.add_argument("--cache-ttl", type=float, default=0, help="Seconds cached measures stay valid (default: 0, no caching)")
+    return parser.parse_args()
+
+
+def collect_keys(args: argparse.Namespace) -> List[str]:
+    keys: List[str] = []
+    if args.projects:
+        keys += [k.strip() for k in args.projects.split(",") if k.strip()]
+    if args.projects_file:
+        keys += [line.strip() for line in args.projects_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if args.config:
+        keys += [c["project_key"] for c in load_project_configs(args.config)]
+    # Preserve order, drop duplicates.
+    return list(dict.fromkeys(keys))
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.token:
+        raise ConfigError("Provide SonarQube URL and token via arguments or environment variables.")
+    keys = collect_keys(args)
+    if not keys:
+        raise ConfigError("Pass --projects, --projects-file or --config.")
+
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+    workers = max(1, args.workers)
+    session = build_session(workers)
+    auth = requests.auth.HTTPBasicAuth(args.token, "")
+    cache = ResponseCache(args.cache_file, args.cache_ttl)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        gate_futures = {key: pool.submit(fetch_gate_status, session, args.url, auth, key) for key in keys}
+        measures = fetch_measures(session, args.url, auth, keys, metrics, cache, pool) if metrics else {}
+        gates = {key: future.result() for key, future in gate_futures.items()}
+    cache.save()
+
+    print_table(keys, gates, measures, metrics)
+    failing = [key for key in keys if gates[key] != "OK"]
+    print(f"{len(keys) - len(failing)}/{len(keys)} quality gate(s) passed in {time.perf_counter() - started:.1f}s")
+    if failing:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
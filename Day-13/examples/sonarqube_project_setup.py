@@ -40,6 +40,10 @@ def load_config(path: Path) -> Dict[str, Any]:
     if not isinstance(data, dict):
         raise ConfigError("Configuration root must be a dictionary.")
 
+    return validate_project_config(data)
+
+
+def validate_project_config(data: Dict[str, Any]) -> Dict[str, Any]:
     required = {"project_key", "project_name"}
     missing = required - data.keys()
     if missing:
@@ -4,7 +4,11 @@ import requests
 from requests.auth import HTTPBasicAuth
 import json
 
-url = "https://veeramallaabhishek.atlassian.net/rest/api/3/issue"
+from jira_client import JiraError, build_session
+from jira_createmeta import CreateMetaCache, ValidationError
+
+base_url = "https://veeramallaabhishek.atlassian.net"
+url = base_url + "/rest/api/3/issue"
 
 API_TOKEN = ""
 
@@ -15,40 +19,58 @@ headers = {
   "Content-Type": "application/json"
 }
 
-payload = json.dumps( {
-  "fields": {
-    "description": {
-      "content": [
-        {
-          "content": [
-            {
-              "text": "My first jira ticket",
-              "type": "text"
-            }
-          ],
-          "type": "paragraph"
-        }
-      ],
-      "type": "doc",
-      "version": 1
-    },
-    "project": {
-      "key": "AB"
-    },
-    "issuetype": {
-      "id": "10006"
-    },
-    "summary": "First JIRA Ticket",
+fields = {
+  "description": {
+    "content": [
+      {
+        "content": [
+          {
+            "text": "My first jira ticket",
+            "type": "text"
+          }
+        ],
+        "type": "paragraph"
+      }
+    ],
+    "type": "doc",
+    "version": 1
+  },
+  "project": {
+    "key": "AB"
+  },
+  # The issue type is looked up by name (cached on disk) instead of hard-coding "10006".
+  "issuetype": {
+    "name": "Task"
   },
-  "update": {}
-} )
-
-response = requests.request(
-   "POST",
-   url,
-   data=payload,
-   headers=headers,
-   auth=auth
-)
-
-print(json.dumps(json.loads(response.text), sort_keys=True, indent=4, separators=(",", ": ")))
\ No newline at end of file
+  "summary": "First JIRA Ticket",
+}
+
+
+def main():
+    # Check the fields against the project's create metadata before sending anything.
+    createmeta = CreateMetaCache(build_session("", API_TOKEN), base_url)
+    try:
+        prepared = createmeta.prepare(fields)
+    except ValidationError as exc:
+        raise SystemExit("Not creating the issue:\n  " + "\n  ".join(exc.problems))
+    except JiraError as exc:
+        raise SystemExit(f"Could not read the create metadata from Jira: {exc}")
+
+    payload = json.dumps( {
+      "fields": prepared,
+      "update": {}
+    } )
+
+    response = requests.request(
+       "POST",
+       url,
+       data=payload,
+       headers=headers,
+       auth=auth
+    )
+
+    print(json.dumps(json.loads(response.text), sort_keys=True, indent=4, separators=(",", ": ")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Create many Jira issues from a CSV, NDJSON or YAML file.
+
+Rows are streamed from the input file, turned into issue payloads (the
+description becomes Atlassian Document Format), and sent 50 at a time to
+`/rest/api/3/issue/bulk` over one pooled session. Elements that fail with a
+transient error (rate limits, 5xx) are retried on their own; validation
+errors are reported and skipped. Every row ends up in an NDJSON mapping file
+with its issue key or error.
+
+Recognized columns: project, issuetype (name), issuetype_id, summary,
+description, labels (comma-separated), priority, assignee (account id),
+parent, external_id, and any customfield_XXXXX.
+
+Unless `--no-validate` is given, every payload is first checked against the
+project's cached create metadata (see `jira_createmeta.py`): issue type names
+become ids, other columns may use field names such as "Story Points", and
+rows with missing required fields or disallowed values are reported without
+a round trip to Jira.
+
+Usage example:
+    python jira_bulk_create.py findings.csv --project AB --issuetype Task --mapping created.ndjson
+    python jira_stub_server.py &   # local stand-in for testing
+    python jira_bulk_create.py findings.csv --url http://127.0.0.1:8089 --project AB --issuetype Task
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+import requests
+
+from jira_client import JiraError, build_session, jira_request
+from jira_createmeta import DEFAULT_CACHE as DEFAULT_META_CACHE
+from jira_createmeta import DEFAULT_TTL as DEFAULT_META_TTL
+from jira_createmeta import CreateMetaCache, ValidationError
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None  # type: ignore
+
+BULK_LIMIT = 50  # Jira accepts at most 50 issueUpdates per bulk call
+MAX_ATTEMPTS = 4
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+KNOWN_COLUMNS = {"project", "issuetype", "issuetype_id", "summary", "description", "labels", "priority", "assignee", "parent", "external_id"}
+
+
+class ConfigError(RuntimeError):
+    pass
+
+
+def iter_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per input row without loading the whole file."""
+    suffix = path.suffix.lower()
+    with path.open(encoding="utf-8", newline="") as handle:
+        if suffix == ".csv":
+            yield from csv.DictReader(handle)
+        elif suffix in {".ndjson", ".jsonl"}:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix in {".yaml", ".yml"}:
+            if yaml is None:
+                raise ConfigError("PyYAML is required for YAML input. Install with `pip install pyyaml`.")
+            # Multi-document YAML streams one document at a time; a document may also hold a list.
+            for document in yaml.safe_load_all(handle):
+                if isinstance(document, list):
+                    yield from document
+                elif document:
+                    yield document
+        else:
+            raise ConfigError("Input must be .csv, .ndjson/.jsonl or .yaml/.yml")
+
+
+def text_to_adf(text: str) -> Dict[str, Any]:
+    """Wrap plain text in an Atlassian Document Format doc, one paragraph per blank-line block."""
+    paragraphs = [block.strip() for block in str(text).split("\n\n") if block.strip()]
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [{"type": "paragraph", "content": [{"type": "text", "text": block}]} for block in paragraphs],
+    }
+
+
+def row_to_issue(row: Dict[str, Any], defaults: Dict[str, str], extra_columns: bool = False) -> Dict[str, Any]:
+    """Build an issue payload; with `extra_columns`, unknown columns are passed on for createmeta to resolve."""
+    values = {**defaults, **{k: v for k, v in row.items() if v not in (None, "")}}
+    if not values.get("project") or not values.get("summary"):
+        raise ConfigError("each row needs a project (or --project) and a summary")
+    if not values.get("issuetype") and not values.get("issuetype_id"):
+        raise ConfigError("each row needs an issuetype/issuetype_id (or --issuetype)")
+
+    fields: Dict[str, Any] = {
+        "project": {"key": values["project"]},
+        "summary": values["summary"],
+        "issuetype": {"id": str(values["issuetype_id"])} if values.get("issuetype_id") else {"name": values["issuetype"]},
+    }
+    if values.get("description"):
+        fields["description"] = text_to_adf(values["description"])
+    if values.get("labels"):
+        labels = values["labels"]
+        fields["labels"] = labels if isinstance(labels, list) else [label.strip() for label in labels.split(",") if label.strip()]
+    if values.get("priority"):
+        fields["priority"] = {"name": values["priority"]}
+    if values.get("assignee"):
+        fields["assignee"] = {"accountId": values["assignee"]}
+    if values.get("parent"):
+        fields["parent"] = {"key": values["parent"]}
+    for key, value in values.items():
+        if key.startswith("customfield_") or (extra_columns and key not in KNOWN_COLUMNS):
+            fields[key] = value
+    return {"fields": fields, "update": {}}
+
+
+class MappingWriter:
+    """Append one JSON line per input row; safe to call from worker threads."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self.handle = handle
+        self.lock = threading.Lock()
+        self.created = 0
+        self.failed = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with self.lock:
+            if record.get("key"):
+                self.created += 1
+            else:
+                self.failed += 1
+            self.handle.write(json.dumps(record) + "\n")
+
+
+def send_chunk(session: requests.Session, base_url: str, chunk: List[Tuple[int, str, Dict[str, Any]]], mapping: MappingWriter) -> None:
+    pending = chunk
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = jira_request(
+                session, "POST", base_url, "/rest/api/3/issue/bulk",
+                json={"issueUpdates": [payload for _, _, payload in pending]},
+                ok_statuses=(400,),  # 400 means "some or all elements failed"; details are in the body
+            )
+        except (JiraError, requests.RequestException) as exc:
+            status = getattr(exc, "status_code", 503)
+            if status not in TRANSIENT_STATUSES or attempt == MAX_ATTEMPTS:
+                for row_number, external_id, _ in pending:
+                    mapping.write({"row": row_number, "external_id": external_id, "error": str(exc)})
+                return
+            time.sleep(2 ** attempt)
+            continue
+
+        body = response.json()
+        if not isinstance(body.get("errors", []), list):
+            # A request-level rejection (e.g. malformed body) has no per-element results.
+            for row_number, external_id, _ in pending:
+                mapping.write({"row": row_number, "external_id": external_id, "error": body})
+            return
+        errors = {error["failedElementNumber"]: error for error in body.get("errors", [])}
+        created = iter(body.get("issues", []))
+        retry: List[Tuple[int, str, Dict[str, Any]]] = []
+        for position, (row_number, external_id, payload) in enumerate(pending):
+            error = errors.get(position)
+            if error is None:
+                issue = next(created)
+                mapping.write({"row": row_number, "external_id": external_id, "key": issue["key"], "id": issue["id"]})
+            elif error.get("status") in TRANSIENT_STATUSES and attempt < MAX_ATTEMPTS:
+                retry.append((row_number, external_id, payload))
+            else:
+                mapping.write({"row": row_number, "external_id": external_id, "error": error.get("elementErrors", error)})
+        if not retry:
+            return
+        # Only the elements that failed transiently are sent again.
+        pending = retry
+        time.sleep(2 ** attempt)
+
+
+def iter_chunks(
+    rows: Iterator[Dict[str, Any]],
+    defaults: Dict[str, str],
+    mapping: MappingWriter,
+    createmeta: Optional[CreateMetaCache] = None,
+) -> Iterator[List[Tuple[int, str, Dict[str, Any]]]]:
+    chunk: List[Tuple[int, str, Dict[str, Any]]] = []
+    for row_number, row in enumerate(rows, start=1):
+        external_id = str(row.get("external_id", row_number))
+        try:
+            payload = row_to_issue(row, defaults, extra_columns=createmeta is not None)
+            if createmeta is not None:
+                payload["fields"] = createmeta.prepare(payload["fields"])
+        except (ConfigError, ValidationError) as exc:
+            mapping.write({"row": row_number, "external_id": external_id, "error": str(exc)})
+            continue
+        chunk.append((row_number, external_id, payload))
+        if len(chunk) == BULK_LIMIT:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_bulk(
+    session: requests.Session,
+    base_url: str,
+    rows: Iterator[Dict[str, Any]],
+    defaults: Dict[str, str],
+    mapping: MappingWriter,
+    workers: int,
+    createmeta: Optional[CreateMetaCache] = None,
+) -> None:
+    in_flight: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk in iter_chunks(rows, defaults, mapping, createmeta):
+            # Cap queued chunks so memory stays flat no matter how big the input is.
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            in_flight.add(pool.submit(send_chunk, session, base_url, chunk, mapping))
+        for future in in_flight:
+            future.result()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-create Jira issues from CSV, NDJSON or YAML")
+    parser.add_argument("input", type=Path, help="Rows to turn into issues (.csv, .ndjson/.jsonl, .yaml/.yml)")
+    parser.add_argument("--url", default=os.getenv("JIRA_URL"), help="Jira base URL (or set JIRA_URL)")
+    parser.add_argument("--email", default=os.getenv("JIRA_EMAIL", ""), help="Account email (or set JIRA_EMAIL)")
+    parser.add_argument("--token", default=os.getenv("JIRA_API_TOKEN"), help="API token (or set JIRA_API_TOKEN)")
+    parser.add_argument("--project", help="Default project key for rows without one")
+    parser.add_argument("--issuetype", help="Default issue type name for rows without one")
+    parser.add_argument("--mapping", type=Path, default=Path("jira_created.ndjson"), help="Where to write row -> issue key results")
+    parser.add_argument("--workers", type=int, default=4, help="Bulk calls in flight at once (default: 4)")
+    parser.add_argument("--no-validate", action="store_true", help="Send payloads without checking them against create metadata")
+    parser.add_argument("--meta-cache", type=Path, default=DEFAULT_META_CACHE, help=f"Create metadata cache (default: {DEFAULT_META_CACHE})")
+    parser.add_argument("--meta-ttl", type=float, default=DEFAULT_META_TTL, help="Seconds cached create metadata stays valid")
+    parser.add_argument("--dry-run", action="store_true", help="Validate rows and print payloads without creating issues")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    defaults = {key: value for key, value in {"project": args.project, "issuetype": args.issuetype}.items() if value}
+    workers = max(1, args.workers)
+    session = build_session(args.email, args.token, pool_size=workers) if args.url and args.token else None
+    createmeta = None
+    if session is not None and not args.no_validate:
+        createmeta = CreateMetaCache(session, args.url, args.meta_cache, args.meta_ttl)
+
+    if args.dry_run:
+        # Without credentials a dry run can only check the row format, not the create metadata.
+        mapping = MappingWriter(open(os.devnull, "w", encoding="utf-8"))
+        count = 0
+        for chunk in iter_chunks(iter_rows(args.input), defaults, mapping, createmeta):
+            for _, _, payload in chunk:
+                print(json.dumps(payload))
+            count += len(chunk)
+        print(f"[dry-run] {count} valid row(s), {mapping.failed} invalid row(s)")
+        return
+
+    if session is None:
+        raise ConfigError("Provide the Jira URL and API token via arguments or environment variables.")
+
+    started = time.perf_counter()
+    with args.mapping.open("w", encoding="utf-8") as handle:
+        mapping = MappingWriter(handle)
+        run_bulk(session, args.url, iter_rows(args.input), defaults, mapping, workers, createmeta)
+    elapsed = time.perf_counter() - started
+    print(f"Created {mapping.created} issue(s), {mapping.failed} failed, in {elapsed:.1f}s. Mapping: {args.mapping}")
+    if mapping.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
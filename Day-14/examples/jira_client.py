@@ -0,0 +1,60 @@
+"""Shared helpers for the Jira Cloud scripts in this folder.
+
+`create-jira.py` and `list_projects.py` show the raw `requests` calls; the
+bulk tools reuse one pooled session and a single request helper that turns
+HTTP errors into exceptions and waits out `429 Too Many Requests` responses.
+
+Credentials come from the environment:
+    export JIRA_URL=https://your-domain.atlassian.net
+    export JIRA_EMAIL=you@example.com
+    export JIRA_API_TOKEN=...
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+class JiraError(RuntimeError):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"Jira API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+def build_session(email: str, token: str, pool_size: int = 10) -> requests.Session:
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(email, token)
+    session.headers.update({"Accept": "application/json", "User-Agent": "python-devops-launchpad"})
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def jira_request(
+    session: requests.Session,
+    method: str,
+    base_url: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Any] = None,
+    ok_statuses: tuple = (),
+) -> requests.Response:
+    """Send one request; statuses in `ok_statuses` are returned instead of raised."""
+    url = f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        response = session.request(method, url, params=params, json=json, timeout=30)
+        if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+            break
+        # Jira Cloud tells us how long to back off; fall back to exponential waits.
+        time.sleep(float(response.headers.get("Retry-After", 2 ** attempt)))
+    if response.status_code >= 400 and response.status_code not in ok_statuses:
+        raise JiraError(response.status_code, response.text[:500])
+    return response
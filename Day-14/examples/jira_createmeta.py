@@ -0,0 +1,216 @@
+"""Cache Jira create metadata and check issue payloads before sending them.
+
+Jira rejects an issue whose issue type does not exist in the project, whose
+required fields are missing, or whose option values are not allowed. Each
+rejection costs a round trip. This module fetches the issue types and field
+schemas of a project once (`/rest/api/3/issue/createmeta/{project}/issuetypes`)
+and keeps them in a JSON cache with a TTL. Payloads are validated against that
+cache, and issue type or field names are turned into ids, before anything is
+sent.
+
+Usage example:
+    python jira_createmeta.py AB                 # issue types of project AB
+    python jira_createmeta.py AB --issuetype Task  # fields for creating a Task
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import requests
+
+from jira_client import JiraError, build_session, jira_request
+
+DEFAULT_CACHE = Path(".jira_createmeta_cache.json")
+DEFAULT_TTL = 24 * 3600  # issue types and field configs change rarely
+PAGE_SIZE = 50
+# Filled in by Jira itself, so never reported as missing.
+IMPLICIT_FIELDS = {"project", "issuetype", "reporter"}
+
+
+class ValidationError(ValueError):
+    def __init__(self, problems: List[str]) -> None:
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def fetch_paged(session: requests.Session, base_url: str, path: str, key: str) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    start_at = 0
+    while True:
+        data = jira_request(session, "GET", base_url, path, params={"startAt": start_at, "maxResults": PAGE_SIZE}).json()
+        page = data.get(key, data.get("values", []))
+        items.extend(page)
+        start_at += len(page)
+        if not page or start_at >= data.get("total", 0):
+            return items
+
+
+def fetch_project_meta(session: requests.Session, base_url: str, project: str) -> Dict[str, Any]:
+    """Return {issue type id: {name, fields: {field id: schema summary}}} for one project."""
+    issue_types: Dict[str, Any] = {}
+    base_path = f"/rest/api/3/issue/createmeta/{project}/issuetypes"
+    for issue_type in fetch_paged(session, base_url, base_path, "issueTypes"):
+        fields = {}
+        for field in fetch_paged(session, base_url, f"{base_path}/{issue_type['id']}", "fields"):
+            schema = field.get("schema", {})
+            fields[field["fieldId"]] = {
+                "name": field.get("name", field["fieldId"]),
+                "required": bool(field.get("required")) and not field.get("hasDefaultValue"),
+                "type": schema.get("type", "string"),
+                "items": schema.get("items"),
+                "allowed": [v.get("name") or v.get("value") for v in field.get("allowedValues", []) if v.get("name") or v.get("value")],
+            }
+        issue_types[issue_type["id"]] = {"name": issue_type["name"], "fields": fields}
+    return issue_types
+
+
+class CreateMetaCache:
+    """Per-project create metadata, fetched once and shared between threads."""
+
+    def __init__(self, session: requests.Session, base_url: str, path: Optional[Path] = DEFAULT_CACHE, ttl: float = DEFAULT_TTL) -> None:
+        self.session = session
+        self.base_url = base_url
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.missing: Set[str] = set()
+        if path and path.exists() and ttl > 0:
+            try:
+                cached = json.loads(path.read_text(encoding="utf-8"))
+                if cached.get("base_url") == base_url:
+                    self.projects = cached.get("projects", {})
+            except ValueError:
+                pass  # corrupt cache: fetch again
+
+    def project(self, key: str, refresh: bool = False) -> Dict[str, Any]:
+        # One lock around the fetch so parallel callers never download the same project twice.
+        with self.lock:
+            if key in self.missing:
+                raise ValidationError([f"project {key} does not exist or is not visible"])
+            entry = self.projects.get(key)
+            if refresh or entry is None or time.time() - entry["fetched_at"] >= self.ttl:
+                try:
+                    issue_types = fetch_project_meta(self.session, self.base_url, key)
+                except JiraError as exc:
+                    if exc.status_code not in (400, 404):
+                        raise
+                    # Remember unknown projects so a file full of them costs one lookup, not one per row.
+                    self.missing.add(key)
+                    raise ValidationError([f"project {key} does not exist or is not visible"]) from None
+                entry = {"fetched_at": time.time(), "issue_types": issue_types}
+                self.projects[key] = entry
+                self.save()
+            return entry["issue_types"]
+
+    def save(self) -> None:
+        if self.path and self.ttl > 0:
+            self.path.write_text(json.dumps({"base_url": self.base_url, "projects": self.projects}), encoding="utf-8")
+
+    def resolve_issue_type(self, project: str, issue_type: Dict[str, str]) -> str:
+        issue_types = self.project(project)
+        wanted = issue_type.get("id") or issue_type.get("name", "")
+        for type_id, meta in issue_types.items():
+            if wanted == type_id or wanted.lower() == meta["name"].lower():
+                return type_id
+        names = ", ".join(sorted(meta["name"] for meta in issue_types.values()))
+        raise ValidationError([f"issue type {wanted!r} does not exist in {project} (available: {names})"])
+
+    def prepare(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Return `fields` with ids resolved and values shaped per schema, or raise ValidationError."""
+        project = (fields.get("project") or {}).get("key") or (fields.get("project") or {}).get("id")
+        if not project:
+            raise ValidationError(["project is required"])
+        type_id = self.resolve_issue_type(project, fields.get("issuetype") or {})
+        type_meta = self.project(project)[type_id]
+        schema = type_meta["fields"]
+        by_name = {meta["name"].lower(): field_id for field_id, meta in schema.items()}
+
+        problems: List[str] = []
+        prepared: Dict[str, Any] = {"project": fields["project"], "issuetype": {"id": type_id}}
+        for name, value in fields.items():
+            if name in prepared:
+                continue
+            field_id = name if name in schema else by_name.get(name.lower())
+            if field_id is None:
+                problems.append(f"field {name!r} is not on the {project}/{type_meta['name']} create screen")
+                continue
+            try:
+                prepared[field_id] = shape_value(schema[field_id], value)
+            except ValueError as exc:
+                problems.append(f"{schema[field_id]['name']}: {exc}")
+
+        for field_id, meta in schema.items():
+            if meta["required"] and field_id not in IMPLICIT_FIELDS and prepared.get(field_id) in (None, "", []):
+                problems.append(f"{meta['name']} ({field_id}) is required")
+        if problems:
+            raise ValidationError(problems)
+        return prepared
+
+
+def shape_value(meta: Dict[str, Any], value: Any) -> Any:
+    """Turn plain CSV-style values into the JSON shape Jira expects and check allowed values."""
+    kind = meta["type"]
+    if kind == "array":
+        items = value if isinstance(value, list) else [part.strip() for part in str(value).split(",") if part.strip()]
+        return [shape_value({**meta, "type": meta.get("items") or "string"}, item) for item in items]
+    if kind == "number" and not isinstance(value, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"{value!r} is not a number") from None
+    if kind in {"priority", "option", "resolution", "version", "component"}:
+        if not isinstance(value, dict):
+            value = {"value": value} if kind == "option" else {"name": value}
+        chosen = value.get("name") or value.get("value")
+        if meta["allowed"] and chosen is not None and chosen not in meta["allowed"]:
+            raise ValueError(f"{chosen!r} is not one of {', '.join(meta['allowed'])}")
+        return value
+    if kind == "user" and not isinstance(value, dict):
+        return {"accountId": value}
+    return value
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Show cached Jira create metadata for a project")
+    parser.add_argument("project", help="Project key")
+    parser.add_argument("--issuetype", help="Show the fields of this issue type (name or id)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cache and fetch from Jira")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE, help=f"Metadata cache (default: {DEFAULT_CACHE})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL, help="Seconds cached metadata stays valid; 0 disables caching")
+    parser.add_argument("--url", default=os.getenv("JIRA_URL"), help="Jira base URL (or set JIRA_URL)")
+    parser.add_argument("--email", default=os.getenv("JIRA_EMAIL", ""), help="Account email (or set JIRA_EMAIL)")
+    parser.add_argument("--token", default=os.getenv("JIRA_API_TOKEN"), help="API token (or set JIRA_API_TOKEN)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.token:
+        raise SystemExit("Provide the Jira URL and API token via arguments or environment variables.")
+
+    cache = CreateMetaCache(build_session(args.email, args.token), args.url, args.cache_file, args.cache_ttl)
+    issue_types = cache.project(args.project, refresh=args.refresh)
+    if not args.issuetype:
+        for type_id, meta in issue_types.items():
+            print(f"{type_id:<8} {meta['name']}")
+        return
+    try:
+        type_id = cache.resolve_issue_type(args.project, {"name": args.issuetype})
+    except ValidationError as exc:
+        raise SystemExit(str(exc))
+    for field_id, meta in issue_types[type_id]["fields"].items():
+        required = "required" if meta["required"] else ""
+        allowed = f" [{', '.join(meta['allowed'])}]" if meta["allowed"] else ""
+        print(f"{field_id:<20} {meta['name']:<24} {meta['type']:<10} {required}{allowed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Export Jira issues matching a JQL query to NDJSON or CSV.
+
+Pages come from `/rest/api/3/search/jql`, which paginates with an opaque
+`nextPageToken` and returns only the `fields` we ask for. While one page is
+being written, the next one is already being fetched in the background. At
+most two pages are held in memory, so exports of any size run in constant
+memory.
+
+After every page the script records the next token and the output file size
+in a checkpoint file. `--resume` truncates the output back to that size and
+carries on from the saved token, so an interrupted export neither loses nor
+duplicates issues.
+
+Usage example:
+    python jira_export.py --jql "project = AB AND statusCategory != Done" --fields summary,status,assignee --output ab.ndjson
+    python jira_export.py --jql "project = AB" --fields summary,status --format csv --output ab.csv --resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+import requests
+
+from jira_client import build_session, jira_request
+
+PAGE_SIZE = 100
+
+
+def fetch_page(
+    session: requests.Session, base_url: str, jql: str, fields: List[str], page_size: int, token: Optional[str]
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"jql": jql, "fields": ",".join(fields), "maxResults": page_size}
+    if token:
+        params["nextPageToken"] = token
+    return jira_request(session, "GET", base_url, "/rest/api/3/search/jql", params=params).json()
+
+
+def flatten_value(value: Any) -> str:
+    """Render a Jira field value as a single CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(flatten_value(item) for item in value)
+    if isinstance(value, dict):
+        for name in ("displayName", "name", "value", "key"):
+            if name in value:
+                return str(value[name])
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+class IssueWriter:
+    def __init__(self, handle: TextIO, output_format: str, fields: List[str], write_header: bool) -> None:
+        self.handle = handle
+        self.output_format = output_format
+        self.fields = fields
+        self.csv_writer = csv.writer(handle) if output_format == "csv" else None
+        if self.csv_writer and write_header:
+            self.csv_writer.writerow(["key", *fields])
+
+    def write(self, issues: List[Dict[str, Any]]) -> None:
+        for issue in issues:
+            values = issue.get("fields", {})
+            if self.csv_writer:
+                self.csv_writer.writerow([issue["key"], *(flatten_value(values.get(name)) for name in self.fields)])
+            else:
+                self.handle.write(json.dumps({"id": issue["id"], "key": issue["key"], "fields": values}) + "\n")
+        self.handle.flush()
+
+
+def load_checkpoint(path: Path, jql: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    if checkpoint.get("jql") != jql or checkpoint.get("fields") != fields:
+        raise SystemExit(f"{path} belongs to a different query; delete it or drop --resume.")
+    return checkpoint
+
+
+def save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    temp = path.with_suffix(path.suffix + ".tmp")
+    temp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(temp, path)
+
+
+def export(
+    session: requests.Session,
+    base_url: str,
+    jql: str,
+    fields: List[str],
+    output: Path,
+    output_format: str,
+    checkpoint_path: Path,
+    resume: bool,
+    page_size: int = PAGE_SIZE,
+) -> int:
+    checkpoint = load_checkpoint(checkpoint_path, jql, fields) if resume else None
+    token = checkpoint["next_page_token"] if checkpoint else None
+    written = checkpoint["written"] if checkpoint else 0
+
+    with output.open("a" if checkpoint else "w", encoding="utf-8", newline="") as handle:
+        if checkpoint:
+            # Drop anything written after the last checkpoint so it is not duplicated.
+            handle.truncate(checkpoint["offset"])
+            handle.seek(checkpoint["offset"])
+        writer = IssueWriter(handle, output_format, fields, write_header=checkpoint is None)
+
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            future: Optional[Future] = prefetch.submit(fetch_page, session, base_url, jql, fields, page_size, token)
+            while future is not None:
+                page = future.result()
+                token = page.get("nextPageToken")
+                last = page.get("isLast", token is None) or not token
+                # Start the next request before writing so network and disk overlap.
+                future = None if last else prefetch.submit(fetch_page, session, base_url, jql, fields, page_size, token)
+
+                issues = page.get("issues", [])
+                writer.write(issues)
+                written += len(issues)
+                if last:
+                    break
+                save_checkpoint(
+                    checkpoint_path,
+                    {"jql": jql, "fields": fields, "next_page_token": token, "offset": handle.tell(), "written": written},
+                )
+    checkpoint_path.unlink(missing_ok=True)
+    return written
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export Jira issues matching a JQL query")
+    parser.add_argument("--jql", required=True, help="JQL query, e.g. 'project = AB ORDER BY key'")
+    parser.add_argument("--fields", default="summary,status,assignee", help="Comma-separated fields to export (default: summary,status,assignee)")
+    parser.add_argument("--output", type=Path, required=True, help="Output file")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="Output format (default: ndjson)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help=f"Issues per request (default: {PAGE_SIZE})")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted export from its checkpoint")
+    parser.add_argument("--url", default=os.getenv("JIRA_URL"), help="Jira base URL (or set JIRA_URL)")
+    parser.add_argument("--email", default=os.getenv("JIRA_EMAIL", ""), help="Account email (or set JIRA_EMAIL)")
+    parser.add_argument("--token", default=os.getenv("JIRA_API_TOKEN"), help="API token (or set JIRA_API_TOKEN)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.token:
+        raise SystemExit("Provide the Jira URL and API token via arguments or environment variables.")
+
+    fields = [name.strip() for name in args.fields.split(",") if name.strip()]
+    checkpoint = args.checkpoint or args.output.with_name(args.output.name + ".checkpoint")
+    session = build_session(args.email, args.token, pool_size=2)
+    started = time.perf_counter()
+    count = export(session, args.url, args.jql, fields, args.output, args.format, checkpoint, args.resume, args.page_size)
+    elapsed = time.perf_counter() - started
+    print(f"Exported {count} issue(s) to {args.output} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} issues/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""A tiny in-memory stand-in for the Jira Cloud REST API, for trying the Jira scripts locally.
+
+Only the endpoints the scripts in this folder use are implemented, with the
+same request and response shapes as Jira Cloud. Any credentials are accepted.
+`--fail-rate` makes a share of bulk elements fail with a 503 so retries can be
+exercised.
+
+Usage example:
+    python jira_stub_server.py --port 8089 --projects AB,OPS --fail-rate 0.1
+    python jira_bulk_create.py rows.csv --url http://127.0.0.1:8089 --token x --project AB --issuetype Task
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ISSUE_TYPES = [
+    {"id": "10004", "name": "Bug"},
+    {"id": "10005", "name": "Story"},
+    {"id": "10006", "name": "Task"},
+]
+
+PRIORITIES = [{"id": "2", "name": "High"}, {"id": "3", "name": "Medium"}, {"id": "4", "name": "Low"}]
+
+
+def field_meta(field_id: str, name: str, schema_type: str, required: bool = False, **extra: Any) -> Dict[str, Any]:
+    return {"fieldId": field_id, "key": field_id, "name": name, "required": required, "schema": {"type": schema_type, **extra}}
+
+
+CREATE_FIELDS = [
+    field_meta("project", "Project", "project", required=True),
+    field_meta("issuetype", "Issue Type", "issuetype", required=True),
+    field_meta("summary", "Summary", "string", required=True),
+    field_meta("description", "Description", "string"),
+    field_meta("labels", "Labels", "array", items="string"),
+    {**field_meta("priority", "Priority", "priority"), "allowedValues": PRIORITIES, "hasDefaultValue": True},
+    field_meta("assignee", "Assignee", "user"),
+    field_meta("parent", "Parent", "issuelink"),
+]
+# Extra fields per issue type id: Bugs need a severity, Stories take story points.
+TYPE_FIELDS = {
+    "10004": [{**field_meta("customfield_10020", "Severity", "option", required=True), "allowedValues": [{"id": "1", "value": "S1"}, {"id": "2", "value": "S2"}, {"id": "3", "value": "S3"}]}],
+    "10005": [field_meta("customfield_10016", "Story Points", "number")],
+    "10006": [],
+}
+
+
+class JiraState:
+    def __init__(self, project_keys: List[str], fail_rate: float) -> None:
+        self.lock = threading.Lock()
+        self.projects = {
+            key: {"id": str(10000 + index), "key": key, "name": f"{key} project", "projectTypeKey": "software"}
+            for index, key in enumerate(project_keys)
+        }
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.counters = {key: 0 for key in project_keys}
+        self.next_id = 10000
+        self.fail_rate = fail_rate
+
+    def validate(self, fields: Dict[str, Any]) -> Dict[str, str]:
+        errors: Dict[str, str] = {}
+        project = fields.get("project") or {}
+        if project.get("key") not in self.projects and project.get("id") not in {p["id"] for p in self.projects.values()}:
+            errors["project"] = "valid project is required"
+        issuetype = fields.get("issuetype") or {}
+        if not any(issuetype.get("id") == t["id"] or issuetype.get("name") == t["name"] for t in ISSUE_TYPES):
+            errors["issuetype"] = "Specify a valid issue type"
+        if not str(fields.get("summary", "")).strip():
+            errors["summary"] = "You must specify a summary of the issue."
+        type_id = next((t["id"] for t in ISSUE_TYPES if issuetype.get("id") == t["id"] or issuetype.get("name") == t["name"]), None)
+        for field in TYPE_FIELDS.get(type_id, []):
+            if field["required"] and not fields.get(field["fieldId"]):
+                errors[field["fieldId"]] = f"{field['name']} is required."
+        return errors
+
+    def create(self, fields: Dict[str, Any]) -> Dict[str, str]:
+        with self.lock:
+            project = self.projects.get(fields["project"].get("key")) or next(
+                p for p in self.projects.values() if p["id"] == fields["project"].get("id")
+            )
+            self.counters[project["key"]] += 1
+            self.next_id += 1
+            key = f"{project['key']}-{self.counters[project['key']]}"
+            issue = {"id": str(self.next_id), "key": key, "self": f"/rest/api/3/issue/{self.next_id}", "fields": fields}
+            self.issues[key] = issue
+        return {"id": issue["id"], "key": key, "self": issue["self"]}
+
+
+class JiraStubHandler(BaseHTTPRequestHandler):
+    state: JiraState
+
+    def log_message(self, format: str, *args: Any) -> None:  # keep the console quiet
+        pass
+
+    def send_json(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def route(self, method: str) -> Optional[Tuple[int, Any]]:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == "GET" and url.path == "/rest/api/3/project/search":
+            return 200, self.search_projects(query)
+        if method == "GET" and url.path == "/rest/api/3/search/jql":
+            return self.search_issues(query)
+        match = re.fullmatch(r"/rest/api/3/issue/createmeta/([^/]+)/issuetypes(?:/(\w+))?", url.path)
+        if method == "GET" and match:
+            return self.createmeta(match.group(1), match.group(2), query)
+        if method == "POST" and url.path == "/rest/api/3/issue":
+            return self.create_issue(self.read_json())
+        if method == "POST" and url.path == "/rest/api/3/issue/bulk":
+            return self.create_bulk(self.read_json())
+        return None
+
+    def search_projects(self, query: Dict[str, str]) -> Dict[str, Any]:
+        projects = sorted(self.state.projects.values(), key=lambda p: p["key"])
+        start_at = int(query.get("startAt", 0))
+        max_results = min(int(query.get("maxResults", 50)), 50)
+        page = projects[start_at:start_at + max_results]
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(projects),
+            "isLast": start_at + max_results >= len(projects),
+            "values": page,
+        }
+
+    def createmeta(self, project: str, type_id: Optional[str], query: Dict[str, str]) -> Tuple[int, Any]:
+        if project not in self.state.projects:
+            return 404, {"errorMessages": ["Issue Does Not Exist"], "errors": {}}
+        if type_id is None:
+            key, values = "issueTypes", ISSUE_TYPES
+        elif type_id in TYPE_FIELDS:
+            key, values = "fields", CREATE_FIELDS + TYPE_FIELDS[type_id]
+        else:
+            return 404, {"errorMessages": ["Issue type not found"], "errors": {}}
+        start_at = int(query.get("startAt", 0))
+        max_results = int(query.get("maxResults", 50))
+        return 200, {"startAt": start_at, "maxResults": max_results, "total": len(values), key: values[start_at:start_at + max_results]}
+
+    def search_issues(self, query: Dict[str, str]) -> Tuple[int, Any]:
+        # Only `project = KEY` is understood; anything else in the JQL is ignored.
+        match = re.search(r"project\s*=\s*\"?(\w+)", query.get("jql", ""), re.IGNORECASE)
+        with self.state.lock:
+            issues = [i for i in self.state.issues.values() if not match or i["key"].split("-")[0] == match.group(1).upper()]
+        start = int(query.get("nextPageToken") or 0)
+        max_results = min(int(query.get("maxResults", 50)), 5000)
+        wanted = [name for name in query.get("fields", "").split(",") if name]
+        page = [
+            {"id": i["id"], "key": i["key"], "fields": {name: i["fields"].get(name) for name in wanted}}
+            for i in issues[start:start + max_results]
+        ]
+        end = start + max_results
+        body: Dict[str, Any] = {"issues": page, "isLast": end >= len(issues)}
+        if end < len(issues):
+            body["nextPageToken"] = str(end)
+        return 200, body
+
+    def create_issue(self, body: Dict[str, Any]) -> Tuple[int, Any]:
+        fields = body.get("fields") or {}
+        errors = self.state.validate(fields)
+        if errors:
+            return 400, {"errorMessages": [], "errors": errors}
+        return 201, self.state.create(fields)
+
+    def create_bulk(self, body: Dict[str, Any]) -> Tuple[int, Any]:
+        updates = body.get("issueUpdates") or []
+        if len(updates) > 50:
+            return 400, {"errorMessages": ["Bulk create accepts at most 50 issues."], "errors": {}}
+        issues, errors = [], []
+        for position, update in enumerate(updates):
+            fields = update.get("fields") or {}
+            if random.random() < self.state.fail_rate:
+                errors.append({"status": 503, "elementErrors": {"errorMessages": ["Service unavailable"]}, "failedElementNumber": position})
+                continue
+            element_errors = self.state.validate(fields)
+            if element_errors:
+                errors.append({"status": 400, "elementErrors": {"errors": element_errors}, "failedElementNumber": position})
+                continue
+            issues.append(self.state.create(fields))
+        return (201 if not errors else 400), {"issues": issues, "errors": errors}
+
+    def handle_method(self, method: str) -> None:
+        try:
+            result = self.route(method)
+        except Exception as exc:  # report bugs in the stub as a 500 instead of dropping the connection
+            result = 500, {"errorMessages": [str(exc)]}
+        if result is None:
+            result = 404, {"errorMessages": [f"No route for {method} {self.path}"]}
+        self.send_json(*result)
+
+    def do_GET(self) -> None:
+        self.handle_method("GET")
+
+    def do_POST(self) -> None:
+        self.handle_method("POST")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local Jira REST stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on (default: 8089)")
+    parser.add_argument("--projects", default="AB,OPS", help="Comma-separated project keys to create (default: AB,OPS)")
+    parser.add_argument("--seed-issues", type=int, default=0, help="Pre-create this many issues in the first project")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of bulk elements that fail with a transient 503")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    state = JiraState([k.strip() for k in args.projects.split(",") if k.strip()], args.fail_rate)
+    for number in range(args.seed_issues):
+        project = next(iter(state.projects))
+        state.create({
+            "project": {"key": project},
+            "issuetype": {"id": "10006"},
+            "summary": f"Seeded issue {number + 1}",
+            "status": {"name": "To Do" if number % 3 else "Done"},
+            "assignee": {"displayName": f"user{number % 7}"} if number % 2 else None,
+            "labels": ["seeded"],
+        })
+    JiraStubHandler.state = state
+    server = ThreadingHTTPServer((args.host, args.port), JiraStubHandler)
+    print(f"Jira stand-in listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
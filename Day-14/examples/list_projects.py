@@ -1,28 +1,114 @@
-# This code sample uses the 'requests' library:
-# http://docs.python-requests.org
-import requests
-from requests.auth import HTTPBasicAuth
+"""List Jira projects, or look one up by key or name.
+
+Projects come from the paginated `/rest/api/3/project/search` endpoint. The
+first page reports `total`, after which the remaining pages are fetched
+concurrently. Only the fields we use are kept, and the trimmed list is cached
+on disk for a TTL so repeated lookups do not touch Jira at all.
+
+Usage example:
+    python list_projects.py
+    python list_projects.py --key AB
+    python list_projects.py --name "platform" --refresh
+"""
+
+from __future__ import annotations
+
+import argparse
 import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from jira_client import build_session, jira_request
+
+PAGE_SIZE = 50  # the largest page /project/search returns
+PROJECT_FIELDS = ("id", "key", "name", "projectTypeKey")
+DEFAULT_CACHE = Path(".jira_projects_cache.json")
+
+
+def fetch_page(session: requests.Session, base_url: str, start_at: int) -> Dict[str, Any]:
+    params = {"startAt": start_at, "maxResults": PAGE_SIZE, "orderBy": "key"}
+    return jira_request(session, "GET", base_url, "/rest/api/3/project/search", params=params).json()
+
+
+def fetch_projects(session: requests.Session, base_url: str, workers: int = 8) -> List[Dict[str, Any]]:
+    first = fetch_page(session, base_url, 0)
+    pages = [first]
+    if not first.get("isLast", True):
+        page_size = first.get("maxResults") or PAGE_SIZE
+        starts = range(page_size, first.get("total", 0), page_size)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            pages += list(pool.map(lambda start: fetch_page(session, base_url, start), starts))
+    # Keep only what the lookups need; full project objects are large.
+    return [{name: project.get(name) for name in PROJECT_FIELDS} for page in pages for project in page.get("values", [])]
+
+
+def load_projects(
+    session: requests.Session,
+    base_url: str,
+    cache_path: Optional[Path],
+    ttl: float,
+    refresh: bool = False,
+    workers: int = 8,
+) -> List[Dict[str, Any]]:
+    if cache_path and cache_path.exists() and not refresh:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("base_url") == base_url and time.time() - cached.get("fetched_at", 0) < ttl:
+                return cached["projects"]
+        except (ValueError, KeyError):
+            pass  # corrupt cache: fetch again
+
+    projects = fetch_projects(session, base_url, workers)
+    if cache_path and ttl > 0:
+        payload = {"base_url": base_url, "fetched_at": time.time(), "projects": projects}
+        cache_path.write_text(json.dumps(payload), encoding="utf-8")
+    return projects
+
 
-url = "https://veeramallaabhishek.atlassian.net/rest/api/3/project"
+def find_projects(projects: List[Dict[str, Any]], key: Optional[str] = None, name: Optional[str] = None) -> List[Dict[str, Any]]:
+    if key:
+        return [p for p in projects if p["key"].lower() == key.lower()]
+    if name:
+        return [p for p in projects if name.lower() in (p.get("name") or "").lower()]
+    return projects
 
-API_TOKEN=""
 
-auth = HTTPBasicAuth("", API_TOKEN)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List Jira projects or look one up by key/name")
+    parser.add_argument("--url", default=os.getenv("JIRA_URL"), help="Jira base URL (or set JIRA_URL)")
+    parser.add_argument("--email", default=os.getenv("JIRA_EMAIL", ""), help="Account email (or set JIRA_EMAIL)")
+    parser.add_argument("--token", default=os.getenv("JIRA_API_TOKEN"), help="API token (or set JIRA_API_TOKEN)")
+    parser.add_argument("--key", help="Show only the project with this key")
+    parser.add_argument("--name", help="Show projects whose name contains this text")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    parser.add_argument("--workers", type=int, default=8, help="Pages fetched in parallel (default: 8)")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE, help=f"Project list cache (default: {DEFAULT_CACHE})")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="Seconds the cached list stays valid; 0 disables caching")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cache and fetch from Jira")
+    return parser.parse_args()
 
-headers = {
-  "Accept": "application/json"
-}
 
-response = requests.request(
-   "GET",
-   url,
-   headers=headers,
-   auth=auth
-)
+def main() -> None:
+    args = parse_args()
+    if not args.url or not args.token:
+        raise SystemExit("Provide the Jira URL and API token via arguments or environment variables.")
 
-output = json.loads(response.text)
+    session = build_session(args.email, args.token, pool_size=max(1, args.workers))
+    projects = load_projects(session, args.url, args.cache_file, args.cache_ttl, args.refresh, args.workers)
+    matches = find_projects(projects, args.key, args.name)
+    if args.json:
+        print(json.dumps(matches, indent=2))
+        return
+    for project in matches:
+        print(f"{project['key']:<12} {project.get('projectTypeKey') or '':<10} {project.get('name')}")
+    if (args.key or args.name) and not matches:
+        raise SystemExit(1)
 
-name = output[0]["name"]
 
-print(name)
\ No newline at end of file
+if __name__ == "__main__":
+    main()